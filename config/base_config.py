@@ -9,6 +9,18 @@ VIDEO_DEFAULTS = {
     'fps': 30,
     'crf': 18,  # Quality: lower = better, 18 is visually lossless
     'preset': 'slow',  # Encoding speed vs compression: slow = better compression
+    'hwaccel': None,  # 'cuda' to run scale/blur/overlay on the GPU (falls back to CPU)
+    'tune': None,  # x264 tune (e.g. 'stillimage'), set automatically by encode_mode
+    'encode_mode': None,  # fast, balanced, quality - overrides preset/crf/tune when set
+    'parallel_segments': None,  # Segments rendered at once (None = half the CPU cores)
+    'segment_batch_size': 1,  # Plain images per FFmpeg run (1 = one process per image)
+}
+
+# Encode modes: name -> (x264 preset, CRF offset, x264 tune)
+ENCODE_MODES = {
+    'fast': ('veryfast', 1, 'stillimage'),
+    'balanced': ('medium', 0, 'stillimage'),
+    'quality': ('slow', 0, 'film'),
 }
 
 # Visual effects settings
@@ -4,6 +4,8 @@ Loads YAML project files and provides access to settings
 """
 
 import os
+import json
+import hashlib
 import yaml
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -15,9 +17,25 @@ from .base_config import (
     COLOR_GRADING_PRESETS,
     TIMING_DEFAULTS,
     AUDIO_DEFAULTS,
-    PARTICLE_OVERLAY_DEFAULTS
+    PARTICLE_OVERLAY_DEFAULTS,
+    ENCODE_MODES
 )
 
+# libyaml's C loader when PyYAML was built with it (much faster), else pure Python
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+
+# Pre-parsed copy of a YAML config, written next to it as <name>.yaml.cache.json
+JSON_CACHE_SUFFIX = '.cache.json'
+
+
+def _content_hash(data: bytes) -> str:
+    """Short content hash used to match a JSON cache to its YAML source"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
 
 class ProjectConfig:
     """
@@ -38,6 +56,21 @@ class ProjectConfig:
         if config_path:
             self._load_config(config_path)
 
+    @classmethod
+    def from_string(cls, yaml_text: str) -> 'ProjectConfig':
+        """
+        Create a project configuration from YAML text (no file on disk)
+
+        Args:
+            yaml_text: YAML document content
+
+        Returns:
+            ProjectConfig with config_path set to None
+        """
+        config = cls()
+        config.config_data = yaml.load(yaml_text, Loader=YamlLoader) or {}
+        return config
+
     def _load_config(self, filepath: str):
         """Load and parse YAML configuration file"""
         filepath = Path(filepath)
@@ -45,8 +78,44 @@ class ProjectConfig:
         if not filepath.exists():
             raise FileNotFoundError(f"Configuration file not found: {filepath}")
 
-        with open(filepath, 'r', encoding='utf-8') as f:
-            self.config_data = yaml.safe_load(f) or {}
+        raw = filepath.read_bytes()
+
+        # Prefer a pre-parsed JSON copy of exactly this content (JSON parses
+        # much faster than YAML)
+        try:
+            cache = json.loads(Path(str(filepath) + JSON_CACHE_SUFFIX).read_bytes())
+            if cache.get('content_sha') == _content_hash(raw):
+                self.config_data = cache['config']
+                return
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+
+        self.config_data = yaml.load(raw.decode('utf-8'), Loader=YamlLoader) or {}
+
+    def write_json_cache(self, yaml_path: str) -> bool:
+        """
+        Write this config's parsed data as a JSON cache next to its YAML file
+
+        The cache is tied to the file's current bytes, so an edited YAML is
+        parsed again. Data that doesn't survive a JSON round trip unchanged
+        (dates, non-string keys) is not cached.
+
+        Args:
+            yaml_path: YAML file this config was parsed from
+
+        Returns:
+            True if the cache was written
+        """
+        try:
+            encoded = json.dumps(self.config_data, ensure_ascii=False)
+            if json.loads(encoded) != self.config_data:
+                return False
+            content_sha = _content_hash(Path(yaml_path).read_bytes())
+            payload = f'{{"content_sha": "{content_sha}", "config": {encoded}}}'
+            Path(str(yaml_path) + JSON_CACHE_SUFFIX).write_text(payload, encoding='utf-8')
+            return True
+        except (OSError, TypeError, ValueError):
+            return False
 
     def get(self, key_path: str, default: Any = None) -> Any:
         """
@@ -79,6 +148,14 @@ class ProjectConfig:
         if project_settings:
             settings.update(project_settings)
 
+        # Encode mode picks preset, CRF offset and tune together
+        encode_mode = settings.get('encode_mode')
+        if encode_mode in ENCODE_MODES:
+            preset, crf_offset, tune = ENCODE_MODES[encode_mode]
+            settings['preset'] = preset
+            settings['crf'] = settings['crf'] + crf_offset
+            settings['tune'] = tune
+
         return settings
 
     def get_effect_settings(self) -> Dict[str, Any]:
@@ -227,6 +304,14 @@ class ProjectConfig:
             if not special_file.exists():
                 errors.append(f"Special image not found: {special_file}")
 
+        # Validate encode mode
+        encode_mode = self.get_video_settings().get('encode_mode')
+        if encode_mode is not None and encode_mode not in ENCODE_MODES:
+            errors.append(
+                f"Unknown encode_mode '{encode_mode}' "
+                f"(expected one of: {', '.join(ENCODE_MODES)})"
+            )
+
         # Validate transition weights sum to 1.0
         weights = self.get_transition_weights()
         weight_sum = sum(weights.values())
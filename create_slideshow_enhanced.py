@@ -167,7 +167,10 @@ def main():
         generator = SlideshowGenerator(project_config, logger)
 
         # Generate slideshow
-        success = generator.generate(images, audio_file, output)
+        try:
+            success = generator.generate(images, audio_file, output)
+        finally:
+            generator.close()
         
         if success:
             print()
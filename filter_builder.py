@@ -5,6 +5,7 @@ Filter Builder Module
 Builds FFmpeg filter chains for images and transitions
 """
 
+from itertools import accumulate
 from typing import List
 from pathlib import Path
 import utils
@@ -149,15 +150,14 @@ class FilterBuilder:
         trans_filters = []
         current_label = labels[0]
 
-        cumulative_time = 0.0
         total_transitions = len(labels) - 1
 
-        for i in range(total_transitions):
-            # Add current segment duration to cumulative time
-            cumulative_time += durations[i]
+        # Cumulative segment end times, computed in one pass
+        segment_ends = accumulate(durations[:total_transitions])
 
+        for i, segment_end in enumerate(segment_ends):
             # Calculate offset: transition starts transition_duration before segment end
-            offset = cumulative_time - self.transition_duration
+            offset = segment_end - self.transition_duration
 
             # Select transition based on configuration weights
             transition = transition_selector.select_next()
@@ -8,7 +8,7 @@ FIXED: Proper duration control using trim filter instead of relying on zoompan '
 import random
 import math
 import logging
-from typing import Tuple, Optional
+from typing import List, Tuple, Optional
 from dataclasses import dataclass
 from enum import Enum
 
@@ -32,6 +32,27 @@ class EasingFunction(Enum):
     EASE_IN_OUT = "ease_in_out"
 
 
+# Effect choices and weights (portrait images prefer vertical motion)
+PORTRAIT_EFFECTS = [
+    KenBurnsType.ZOOM_IN,
+    KenBurnsType.ZOOM_OUT,
+    KenBurnsType.PAN_UP,
+    KenBurnsType.PAN_DOWN,
+]
+PORTRAIT_WEIGHTS = [0.3, 0.3, 0.2, 0.2]
+LANDSCAPE_EFFECTS = list(KenBurnsType)
+LANDSCAPE_WEIGHTS = [0.25, 0.25, 0.15, 0.15, 0.05, 0.05, 0.10]
+
+# Easing choices, with preference for smooth easing
+EASING_OPTIONS = [
+    EasingFunction.EASE_IN_OUT,
+    EasingFunction.EASE_OUT,
+    EasingFunction.EASE_IN,
+    EasingFunction.LINEAR,
+]
+EASING_WEIGHTS = [0.5, 0.3, 0.15, 0.05]
+
+
 @dataclass
 class KenBurnsConfig:
     """Configuration for Ken Burns effect"""
@@ -97,17 +118,60 @@ class KenBurnsGenerator:
 
         # Update statistics
         self.stats[effect_type.value] += 1
+        self._log_config(config)
+
+        return config
+
+    def generate_batch(self, portrait_flags: List[bool]) -> List[Optional[KenBurnsConfig]]:
+        """
+        Generate Ken Burns configurations for a whole image list at once
+
+        Random draws (application, effect type, easing, speed) are made with
+        one random.choices(k=...) call per kind instead of per image.
 
+        Args:
+            portrait_flags: Whether each image is portrait orientation
+
+        Returns:
+            KenBurnsConfig (or None if no effect) per image, in order
+        """
+        applied = [random.random() < self.application_rate for _ in portrait_flags]
+        applied_count = sum(applied)
+        portrait_count = sum(1 for apply, portrait in zip(applied, portrait_flags)
+                             if apply and portrait)
+
+        portrait_types = iter(random.choices(
+            PORTRAIT_EFFECTS, weights=PORTRAIT_WEIGHTS, k=portrait_count))
+        landscape_types = iter(random.choices(
+            LANDSCAPE_EFFECTS, weights=LANDSCAPE_WEIGHTS, k=applied_count - portrait_count))
+        easings = iter(random.choices(EASING_OPTIONS, weights=EASING_WEIGHTS, k=applied_count))
+        speeds = iter(random.choices(self.speed_variations, k=applied_count))
+
+        configs = []
+        for apply, is_portrait in zip(applied, portrait_flags):
+            if not apply:
+                self.stats["none"] += 1
+                configs.append(None)
+                continue
+
+            effect_type = next(portrait_types if is_portrait else landscape_types)
+            config = self._generate_config(effect_type, next(easings), next(speeds))
+            self.stats[effect_type.value] += 1
+            self._log_config(config)
+            configs.append(config)
+
+        return configs
+
+    def _log_config(self, config: KenBurnsConfig) -> None:
+        """Log a generated effect at debug level"""
         self.logger.debug(
-            f"Generated Ken Burns: {effect_type.value}, "
+            f"Generated Ken Burns: {config.effect_type.value}, "
             f"zoom: {config.zoom_start:.3f}->{config.zoom_end:.3f}, "
             f"pan: ({config.pan_x:.3f}, {config.pan_y:.3f}), "
             f"easing: {config.easing.value}, "
             f"speed: {config.speed_multiplier:.2f}x"
         )
 
-        return config
-
     def _select_effect_type(self, is_portrait: bool) -> KenBurnsType:
         """
         Select appropriate Ken Burns effect type
@@ -120,25 +184,20 @@ class KenBurnsGenerator:
         """
         # For portrait images, prefer vertical effects
         if is_portrait:
-            effects = [
-                KenBurnsType.ZOOM_IN,
-                KenBurnsType.ZOOM_OUT,
-                KenBurnsType.PAN_UP,
-                KenBurnsType.PAN_DOWN,
-            ]
-            weights = [0.3, 0.3, 0.2, 0.2]
-        else:
-            effects = list(KenBurnsType)
-            weights = [0.25, 0.25, 0.15, 0.15, 0.05, 0.05, 0.10]
-
-        return random.choices(effects, weights=weights)[0]
-
-    def _generate_config(self, effect_type: KenBurnsType) -> KenBurnsConfig:
+            return random.choices(PORTRAIT_EFFECTS, weights=PORTRAIT_WEIGHTS)[0]
+
+        return random.choices(LANDSCAPE_EFFECTS, weights=LANDSCAPE_WEIGHTS)[0]
+
+    def _generate_config(self, effect_type: KenBurnsType,
+                         easing: Optional[EasingFunction] = None,
+                         speed_multiplier: Optional[float] = None) -> KenBurnsConfig:
         """
         Generate configuration for specific effect type
 
         Args:
             effect_type: Type of Ken Burns effect
+            easing: Pre-drawn easing (drawn here if None)
+            speed_multiplier: Pre-drawn speed multiplier (drawn here if None)
 
         Returns:
             KenBurnsConfig object
@@ -152,8 +211,9 @@ class KenBurnsGenerator:
             pan_x=0.0,
             pan_y=0.0,
             effect_type=effect_type,
-            easing=self._select_easing(),
-            speed_multiplier=random.choice(self.speed_variations)
+            easing=easing or self._select_easing(),
+            speed_multiplier=(speed_multiplier if speed_multiplier is not None
+                              else random.choice(self.speed_variations))
         )
 
         # Adjust based on effect type
@@ -195,15 +255,7 @@ class KenBurnsGenerator:
 
     def _select_easing(self) -> EasingFunction:
         """Select easing function with preference for smooth easing"""
-        options = [
-            EasingFunction.EASE_IN_OUT,
-            EasingFunction.EASE_OUT,
-            EasingFunction.EASE_IN,
-            EasingFunction.LINEAR,
-        ]
-        weights = [0.5, 0.3, 0.15, 0.05]
-
-        return random.choices(options, weights=weights)[0]
+        return random.choices(EASING_OPTIONS, weights=EASING_WEIGHTS)[0]
 
     def get_statistics(self) -> dict:
         """Get statistics about Ken Burns usage"""
@@ -6,16 +6,73 @@ Renders individual video segments (opening, images, closing)
 FIXED: Remove -t from input to let filter chain control duration
 """
 
+import os
+import re
+import hashlib
 import subprocess
+import threading
 import time
-import json
+from collections import deque
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 import logging
 import ken_burns
 import color_grading
 import utils
 
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+# FFmpeg progress line, e.g. "frame=  150 fps= 30 q=28.0 size=... time=00:00:05.00 ..."
+_PROGRESS_RE = re.compile(rb'frame=\s*(\d+).*?time=(\S+)')
+# Pipe buffer for FFmpeg output (large reads instead of one syscall per line)
+_PIPE_BUFSIZE = 1 << 20
+# FFmpeg ends progress updates with '\r' and everything else with '\n'
+_LINE_SPLIT_RE = re.compile(rb'[\r\n]+')
+# Filter graph link label, e.g. "[0:v]" or "[bg]"
+_LINK_LABEL_RE = re.compile(r'\[([^\]]+)\]')
+# Stills decoded with Pillow and piped to FFmpeg as raw RGB (JPEG stays with libavcodec)
+_RAW_INPUT_EXTENSIONS = ('.png', '.bmp', '.tif', '.tiff', '.webp')
+# Largest still piped as raw RGB24 (each parallel worker holds one frame);
+# bigger images are read by FFmpeg itself with -loop 1 -i
+_MAX_RAW_FRAME_BYTES = 16 * 1024 * 1024
+# FFmpeg output lines reported when a render fails
+_ERROR_TAIL_LINES = 20
+# Pre-faded audio tracks kept in the output folder's cache (least recently used evicted)
+MAX_CACHED_AUDIO_TRACKS = 3
+
+
+def _feed_stdin(stream, data: bytes) -> None:
+    """Write data to a subprocess stdin and close it (runs on a helper thread)"""
+    try:
+        stream.write(data)
+    except (BrokenPipeError, OSError):
+        pass  # FFmpeg exited early; its output and return code tell why
+    finally:
+        try:
+            stream.close()
+        except (BrokenPipeError, OSError):
+            pass
+
+
+def _iter_ffmpeg_lines(stream):
+    """Yield raw output lines from a binary FFmpeg pipe, splitting on '\\r' and '\\n'"""
+    pending = b''
+    while True:
+        chunk = stream.read1(_PIPE_BUFSIZE)
+        if not chunk:
+            break
+        lines = _LINE_SPLIT_RE.split(pending + chunk)
+        pending = lines.pop()
+        for line in lines:
+            if line:
+                yield line
+    if pending:
+        yield pending
+
 
 class SegmentRenderer:
     """Renders video segments individually for memory-efficient processing"""
@@ -25,7 +82,8 @@ class SegmentRenderer:
         Initialize segment renderer
         
         Args:
-            video_settings: Video configuration (resolution, fps, crf, preset)
+            video_settings: Video configuration (resolution, fps, crf, preset, tune,
+                parallel_segments)
             logger: Logger instance
         """
         self.logger = logger
@@ -33,6 +91,36 @@ class SegmentRenderer:
         self.fps = video_settings['fps']
         self.crf = video_settings['crf']
         self.preset = video_settings['preset']
+        self.tune = video_settings.get('tune')
+
+        # Split the cores between segments rendered at the same time
+        # (default: half the cores, each FFmpeg is itself multi-threaded)
+        cpu_count = os.cpu_count() or 1
+        self.parallel_segments = max(
+            1, video_settings.get('parallel_segments') or cpu_count // 2
+        )
+        self.threads = max(1, cpu_count // self.parallel_segments)
+
+        # Multi-threaded filter graphs (libavfilter runs single-threaded by default)
+        self.thread_args = [
+            '-filter_threads', str(self.threads),
+            '-filter_complex_threads', str(self.threads),
+        ]
+
+        # x264 options shared by every encode
+        self.encoder_args = [
+            '-c:v', 'libx264',
+            '-preset', self.preset,
+            '-crf', str(self.crf),
+            '-threads', str(self.threads),
+            # Identical SPS/PPS and fixed GOPs in every segment, each opening
+            # on an IDR, so the concat demuxer can stream-copy across seams
+            '-x264-params',
+            f'stitchable=1:keyint={2 * self.fps}:min-keyint={self.fps}:scenecut=0',
+            '-force_key_frames', 'expr:eq(n,0)',
+        ]
+        if self.tune:
+            self.encoder_args.extend(['-tune', self.tune])
         
     def render_segment(
         self,
@@ -42,9 +130,16 @@ class SegmentRenderer:
         filter_str: str,
         output_file: str,
         show_progress: bool = True,
-        overlay_path: str = None
+        overlay_path: str = None,
+        static_copy: bool = False
     ) -> bool:
-        """Render a single video segment with detailed logging"""
+        """
+        Render a single video segment with detailed logging
+
+        When static_copy is set (every output frame is identical), a single
+        frame is encoded and then stream-copied to the full duration instead
+        of running libx264 over duration * fps identical frames.
+        """
 
         # CRITICAL DEBUG: Log the exact duration being used
         self.logger.info(f"=" * 70)
@@ -57,18 +152,25 @@ class SegmentRenderer:
             self.logger.info(f"  Particle overlay: {Path(overlay_path).name}")
         self.logger.info(f"=" * 70)
 
+        # Fast path: identical frames, no overlay to composite
+        if static_copy and not (overlay_path and Path(overlay_path).exists()):
+            return self._render_static_copy(
+                segment_name, input_file, duration, filter_str, output_file
+            )
+
         # If overlay video provided, add as second input and composite
         if overlay_path and Path(overlay_path).exists():
             filter_str = filter_str.replace('[out]', '[base]')
             filter_str += ';[1:v]format=rgba[ov];[base][ov]overlay=0:0:shortest=1[out]'
 
+        input_args, filter_str, frame_data = self._image_input(input_file, filter_str)
+
         # CRITICAL FIX: Remove -t from input, let filter chain control duration
         # The filter chain now includes trim=duration={duration} to cut precisely
         cmd = [
             'ffmpeg', '-y',
-            '-loop', '1',
-            # REMOVED: '-t', str(duration),  # Don't limit input duration
-            '-i', input_file,
+            *self.thread_args,
+            *input_args,
         ]
 
         # Add overlay video as second input if provided
@@ -78,9 +180,7 @@ class SegmentRenderer:
         cmd.extend([
             '-filter_complex', filter_str,
             '-map', '[out]',
-            '-c:v', 'libx264',
-            '-preset', self.preset,
-            '-crf', str(self.crf),
+            *self.encoder_args,
             '-pix_fmt', 'yuv420p',
             '-an',
             '-movflags', '+faststart',
@@ -90,47 +190,128 @@ class SegmentRenderer:
         # DEBUG: Log the complete FFmpeg command
         self.logger.debug(f"FFmpeg command: {' '.join(cmd)}")
         
+        return self._run_render(
+            segment_name, cmd, duration, output_file, show_progress, frame_data
+        )
+
+    def render_batch(
+        self,
+        segment_name: str,
+        input_files: List[str],
+        duration: float,
+        filter_str: str,
+        output_file: str,
+        show_progress: bool = True
+    ) -> bool:
+        """
+        Render several images into one segment with a single FFmpeg process
+
+        Args:
+            segment_name: Name for logging
+            input_files: Image paths, input i is read as [i:v]
+            duration: Total duration of the batch in seconds
+            filter_str: Batch filter (see SegmentFilterBuilder.build_batch_filter)
+            output_file: Output segment path
+            show_progress: Print FFmpeg progress lines
+
+        Returns:
+            True if successful
+        """
+        self.logger.info(f"=" * 70)
+        self.logger.info(f"RENDERING: {segment_name}")
+        self.logger.info(f"  Inputs: {len(input_files)} images")
+        self.logger.info(f"  Duration: {duration:.2f} seconds")
+        self.logger.info(f"  Expected frames: {int(duration * self.fps)} @ {self.fps}fps")
+        self.logger.info(f"=" * 70)
+
+        cmd = ['ffmpeg', '-y', *self.thread_args]
+        for input_file in input_files:
+            cmd.extend(['-loop', '1', '-i', input_file])
+        cmd.extend([
+            '-filter_complex', filter_str,
+            '-map', '[out]',
+            *self.encoder_args,
+            '-pix_fmt', 'yuv420p',
+            '-an',
+            '-movflags', '+faststart',
+            output_file
+        ])
+
+        self.logger.debug(f"FFmpeg command: {' '.join(cmd)}")
+
+        return self._run_render(segment_name, cmd, duration, output_file, show_progress)
+
+    def _run_render(
+        self,
+        segment_name: str,
+        cmd: List[str],
+        duration: float,
+        output_file: str,
+        show_progress: bool,
+        frame_data: Optional[bytes] = None
+    ) -> bool:
+        """
+        Run an FFmpeg segment encode, report progress and verify the output
+
+        Args:
+            segment_name: Name for logging
+            cmd: Complete FFmpeg command
+            duration: Expected segment duration in seconds
+            output_file: Output segment path
+            show_progress: Print FFmpeg progress lines
+            frame_data: Raw frame to write to FFmpeg's stdin, if any
+
+        Returns:
+            True if successful
+        """
         try:
             start_time = time.time()
             
             process = subprocess.Popen(
                 cmd,
+                stdin=subprocess.PIPE if frame_data else subprocess.DEVNULL,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                encoding='utf-8',
-                errors='replace'
+                bufsize=_PIPE_BUFSIZE
             )
+
+            # One frame is enough, the loop filter repeats it. Written from a
+            # helper thread so FFmpeg's output keeps draining while it reads
+            feeder = None
+            if frame_data:
+                feeder = threading.Thread(
+                    target=_feed_stdin, args=(process.stdin, frame_data), daemon=True
+                )
+                feeder.start()
             
             last_progress_time = time.time()
             frame_count = 0
             last_time_str = "00:00:00"
+            output_tail = deque(maxlen=_ERROR_TAIL_LINES)
             
-            for line in process.stdout:
+            for line in _iter_ffmpeg_lines(process.stdout):
+                text = line.decode('utf-8', errors='replace')
+                output_tail.append(text)
+
                 # Log all output at debug level
-                self.logger.debug(f"FFmpeg: {line.rstrip()}")
+                self.logger.debug(f"FFmpeg: {text}")
                 
                 # Extract frame count and time from FFmpeg output
-                if 'frame=' in line:
-                    try:
-                        # Parse frame number
-                        frame_part = line.split('frame=')[1].split()[0]
-                        frame_count = int(frame_part)
-                        
-                        # Parse time
-                        if 'time=' in line:
-                            time_part = line.split('time=')[1].split()[0]
-                            last_time_str = time_part
-                    except:
-                        pass
+                match = _PROGRESS_RE.search(line)
+                if match:
+                    frame_count = int(match.group(1))
+                    last_time_str = match.group(2).decode('ascii', errors='replace')
                     
                     # Show progress every 2 seconds
                     if show_progress:
                         current_time = time.time()
                         if current_time - last_progress_time >= 2:
-                            print(f"\r  {segment_name}: {line.strip()}", end='', flush=True)
+                            print(f"\r  {segment_name}: {text.strip()}", end='', flush=True)
                             last_progress_time = current_time
             
             process.wait()
+            if feeder:
+                feeder.join()
             
             if show_progress:
                 print()  # New line after progress
@@ -142,8 +323,12 @@ class SegmentRenderer:
                 if Path(output_file).exists():
                     file_size = Path(output_file).stat().st_size / (1024 * 1024)
                     
-                    # Get actual duration of rendered segment
-                    actual_duration = self._get_duration(output_file)
+                    # Derive actual duration from the frame count FFmpeg reported,
+                    # only spawning ffprobe when no progress line was seen
+                    if frame_count:
+                        actual_duration = frame_count / self.fps
+                    else:
+                        actual_duration = self._get_duration(output_file)
                     
                     # CRITICAL VERIFICATION
                     expected_frames = int(duration * self.fps)
@@ -169,6 +354,8 @@ class SegmentRenderer:
                     return False
             else:
                 self.logger.error(f"✗ {segment_name} failed with return code {process.returncode}")
+                for text in output_tail:
+                    self.logger.error(f"  FFmpeg: {text}")
                 return False
                 
         except Exception as e:
@@ -177,6 +364,150 @@ class SegmentRenderer:
             self.logger.error(traceback.format_exc())
             return False
     
+    def _render_static_copy(
+        self,
+        segment_name: str,
+        input_file: str,
+        duration: float,
+        filter_str: str,
+        output_file: str
+    ) -> bool:
+        """
+        Render a segment of identical frames without re-encoding every frame
+
+        Step 1 encodes a single IDR frame through the normal filter chain,
+        step 2 loops that one-frame clip to the requested duration with -c copy.
+
+        Returns:
+            True if successful
+        """
+        output_path = Path(output_file)
+        still_file = output_path.with_name(f"{output_path.stem}_still.mp4")
+
+        input_args, filter_str, frame_data = self._image_input(input_file, filter_str)
+
+        encode_cmd = [
+            'ffmpeg', '-y',
+            *self.thread_args,
+            *input_args,
+            '-filter_complex', filter_str,
+            '-map', '[out]',
+            '-frames:v', '1',
+            *self.encoder_args,
+            '-pix_fmt', 'yuv420p',
+            '-an',
+            str(still_file)
+        ]
+
+        copy_cmd = [
+            'ffmpeg', '-y',
+            '-stream_loop', '-1',
+            '-i', str(still_file),
+            '-t', str(duration),
+            '-c', 'copy',
+            '-movflags', '+faststart',
+            output_file
+        ]
+
+        self.logger.debug(f"FFmpeg still command: {' '.join(encode_cmd)}")
+        self.logger.debug(f"FFmpeg copy command: {' '.join(copy_cmd)}")
+
+        try:
+            start_time = time.time()
+
+            for cmd, stdin_data in ((encode_cmd, frame_data), (copy_cmd, None)):
+                result = subprocess.run(
+                    cmd,
+                    input=stdin_data,
+                    stdin=None if stdin_data else subprocess.DEVNULL,
+                    capture_output=True,
+                    bufsize=_PIPE_BUFSIZE
+                )
+                if result.returncode != 0:
+                    self.logger.error(
+                        f"✗ {segment_name} failed with return code {result.returncode}"
+                    )
+                    self.logger.debug(
+                        f"FFmpeg: {result.stderr.decode('utf-8', errors='replace')}"
+                    )
+                    return False
+
+            elapsed = time.time() - start_time
+
+            if not output_path.exists():
+                self.logger.error(f"✗ {segment_name} output file not created")
+                return False
+
+            file_size = output_path.stat().st_size / (1024 * 1024)
+            actual_duration = self._get_duration(output_file)
+            duration_diff = abs(actual_duration - duration)
+
+            self.logger.info(f"✓ {segment_name} completed in {elapsed:.1f}s (static copy)")
+            self.logger.info(f"  File size: {file_size:.2f} MB")
+            self.logger.info(f"  Expected: {duration:.2f}s, Rendered: {actual_duration:.2f}s")
+
+            if duration_diff > 0.5:
+                self.logger.warning(f"  ⚠️  Duration difference: {duration_diff:.2f}s")
+            else:
+                self.logger.info(f"  ✓ Duration matches: ±{duration_diff:.2f}s")
+
+            return True
+
+        except Exception as e:
+            self.logger.error(f"✗ {segment_name} exception: {e}")
+            import traceback
+            self.logger.error(traceback.format_exc())
+            return False
+
+        finally:
+            if still_file.exists():
+                still_file.unlink()
+
+    def _image_input(self, input_file: str, filter_str: str):
+        """
+        Build the FFmpeg input arguments for a still image
+
+        Non-JPEG stills are decoded once with Pillow and fed on stdin as a
+        single rawvideo RGB24 frame, so FFmpeg skips its own image decode.
+        The input is then looped with the loop filter instead of '-loop 1'.
+        Stills over _MAX_RAW_FRAME_BYTES decoded stay with '-loop 1 -i'.
+
+        Args:
+            input_file: Path to the image
+            filter_str: Filter chain reading from [0:v]
+
+        Returns:
+            Tuple of (input args, filter string, raw frame bytes or None)
+        """
+        file_args = ['-loop', '1', '-i', input_file]
+
+        if not PIL_AVAILABLE or not input_file.lower().endswith(_RAW_INPUT_EXTENSIONS):
+            return file_args, filter_str, None
+
+        try:
+            with Image.open(input_file) as img:
+                # Size comes from the header, so oversized stills skip the decode
+                if img.width * img.height * 3 > _MAX_RAW_FRAME_BYTES:
+                    return file_args, filter_str, None
+                frame = img.convert('RGB')
+        except (OSError, ValueError) as e:
+            self.logger.debug(f"Pillow could not decode {Path(input_file).name}: {e}")
+            return file_args, filter_str, None
+
+        width, height = frame.size
+        input_args = [
+            '-f', 'rawvideo',
+            '-pix_fmt', 'rgb24',
+            '-s', f'{width}x{height}',
+            '-framerate', str(self.fps),
+            '-i', 'pipe:0',
+        ]
+        filter_str = (
+            f"[0:v]loop=loop=-1:size=1,setpts=N/({self.fps}*TB)[still];"
+            + filter_str.replace('[0:v]', '[still]')
+        )
+        return input_args, filter_str, frame.tobytes()
+
     def add_simple_fade_transition(
         self,
         segment1: str,
@@ -198,14 +529,13 @@ class SegmentRenderer:
         """
         cmd = [
             'ffmpeg', '-y',
+            *self.thread_args,
             '-i', segment1,
             '-i', segment2,
             '-filter_complex',
             f'[0:v][1:v]xfade=transition=fade:duration={fade_duration}:offset=-{fade_duration}[out]',
             '-map', '[out]',
-            '-c:v', 'libx264',
-            '-preset', self.preset,
-            '-crf', str(self.crf),
+            *self.encoder_args,
             '-pix_fmt', 'yuv420p',
             '-an',
             '-movflags', '+faststart',
@@ -220,7 +550,8 @@ class SegmentRenderer:
                 capture_output=True,
                 text=True,
                 encoding='utf-8',
-                errors='replace'
+                errors='replace',
+                bufsize=_PIPE_BUFSIZE
             )
             
             if result.returncode == 0:
@@ -240,7 +571,9 @@ class SegmentRenderer:
         audio_file: str,
         output_file: str,
         audio_fade_in: float = 1.0,
-        audio_fade_out: float = 2.0
+        audio_fade_out: float = 2.0,
+        audio_duration: Optional[float] = None,
+        prepared_audio: Optional[Tuple[str, List[str]]] = None
     ) -> bool:
         """
         Concatenate all video segments and add audio
@@ -251,6 +584,8 @@ class SegmentRenderer:
             output_file: Final output video path
             audio_fade_in: Audio fade in duration
             audio_fade_out: Audio fade out duration
+            audio_duration: Known audio duration (probed with ffprobe if None)
+            prepared_audio: Result of prepare_audio() if it already ran
             
         Returns:
             True if successful
@@ -261,31 +596,29 @@ class SegmentRenderer:
         
         self.logger.info(f"Concatenating {len(segments)} segments...")
         
-        # Create concat list file
-        concat_list = Path(output_file).parent / 'concat_list.txt'
-        
         try:
-            with open(concat_list, 'w', encoding='utf-8') as f:
-                for segment in segments:
-                    # FFmpeg concat requires forward slashes and escaped special chars
-                    segment_path = str(Path(segment).resolve()).replace('\\', '/')
-                    f.write(f"file '{segment_path}'\n")
-            
-            # Get audio duration for fade out
-            audio_duration = self._get_duration(audio_file)
+            # Concat list is piped to FFmpeg's stdin, no list file on disk
+            # FFmpeg concat requires forward slashes and escaped special chars
+            segment_paths = [os.path.abspath(segment).replace('\\', '/') for segment in segments]
+            concat_list = ''.join(f"file '{path}'\n" for path in segment_paths).encode('utf-8')
             
+            if prepared_audio is None:
+                prepared_audio = self.prepare_audio(
+                    audio_file, output_file, audio_fade_in, audio_fade_out, audio_duration
+                )
+            copy_audio, audio_args = prepared_audio
+
             # Concatenate with audio
             cmd = [
                 'ffmpeg', '-y',
+                *self.thread_args,
                 '-f', 'concat',
                 '-safe', '0',
-                '-i', str(concat_list),
-                '-i', audio_file,
+                '-protocol_whitelist', 'file,pipe',
+                '-i', 'pipe:0',
+                '-i', copy_audio,
                 '-c:v', 'copy',  # Copy video (already encoded)
-                '-c:a', 'aac',
-                '-b:a', '320k',
-                '-af', f'afade=t=in:st=0:d={audio_fade_in},'
-                       f'afade=t=out:st={audio_duration-audio_fade_out}:d={audio_fade_out}',
+                *audio_args,
                 '-shortest',
                 '-movflags', '+faststart',
                 output_file
@@ -297,21 +630,24 @@ class SegmentRenderer:
             
             process = subprocess.Popen(
                 cmd,
+                stdin=subprocess.PIPE,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                encoding='utf-8',
-                errors='replace'
+                bufsize=_PIPE_BUFSIZE
             )
+            process.stdin.write(concat_list)
+            process.stdin.close()
             
             last_progress_time = time.time()
             
-            for line in process.stdout:
-                self.logger.debug(f"FFmpeg: {line.rstrip()}")
+            for line in _iter_ffmpeg_lines(process.stdout):
+                text = line.decode('utf-8', errors='replace')
+                self.logger.debug(f"FFmpeg: {text}")
                 
-                if 'time=' in line:
+                if b'time=' in line:
                     current_time = time.time()
                     if current_time - last_progress_time >= 3:
-                        print(f"\r  Final merge: {line.strip()}", end='', flush=True)
+                        print(f"\r  Final merge: {text.strip()}", end='', flush=True)
                         last_progress_time = current_time
             
             process.wait()
@@ -336,26 +672,174 @@ class SegmentRenderer:
         except Exception as e:
             self.logger.error(f"Concatenation exception: {e}")
             return False
-            
-        finally:
-            # Cleanup concat list
-            if concat_list.exists():
-                concat_list.unlink()
     
+    def prepare_audio(
+        self,
+        audio_file: str,
+        output_file: str,
+        audio_fade_in: float = 1.0,
+        audio_fade_out: float = 2.0,
+        audio_duration: Optional[float] = None
+    ) -> Tuple[str, List[str]]:
+        """
+        Pick the audio input and codec arguments for the final merge
+
+        Independent of the video segments, so it can run while they render.
+
+        Args:
+            audio_file: Audio file path
+            output_file: Final output video path (locates the audio cache)
+            audio_fade_in: Audio fade in duration
+            audio_fade_out: Audio fade out duration
+            audio_duration: Known audio duration (probed with ffprobe if None)
+
+        Returns:
+            Tuple of (audio input path, FFmpeg audio arguments)
+        """
+        # Get audio duration for fade out (reuse the caller's probe if given)
+        if audio_duration is None:
+            audio_duration = self._get_duration(audio_file)
+
+        # Use a ready-to-copy AAC track when possible (source AAC without
+        # fades, or a cached pre-faded encode) instead of re-encoding audio
+        audio_cache_dir = Path(output_file).parent / utils.CACHE_DIR_NAME
+        copy_audio = self._prepare_copyable_audio(
+            audio_file, audio_duration, audio_fade_in, audio_fade_out,
+            audio_cache_dir
+        )
+
+        if copy_audio:
+            return copy_audio, ['-c:a', 'copy']
+
+        return audio_file, [
+            '-c:a', 'aac',
+            '-b:a', '320k',
+            '-af', self._audio_fade_filter(audio_duration, audio_fade_in, audio_fade_out),
+        ]
+
+    @staticmethod
+    def _audio_fade_filter(audio_duration: float, fade_in: float, fade_out: float) -> str:
+        """Build the afade filter for the soundtrack"""
+        return (
+            f'afade=t=in:st=0:d={fade_in},'
+            f'afade=t=out:st={audio_duration-fade_out}:d={fade_out}'
+        )
+
+    def _prepare_copyable_audio(
+        self,
+        audio_file: str,
+        audio_duration: float,
+        fade_in: float,
+        fade_out: float,
+        cache_dir: Path
+    ) -> Optional[str]:
+        """
+        Get an AAC track that can be muxed with -c:a copy
+
+        Args:
+            audio_file: Source audio file
+            audio_duration: Source audio duration in seconds
+            fade_in: Audio fade in duration
+            fade_out: Audio fade out duration
+            cache_dir: Directory for pre-faded audio reused across renders
+
+        Returns:
+            Path to the AAC file to copy, or None to encode inline
+        """
+        if not fade_in and not fade_out and self._get_audio_codec(audio_file) == 'aac':
+            self.logger.info("Source audio is AAC without fades, copying audio stream")
+            return audio_file
+
+        # Pre-faded encode keyed on source identity + fade settings
+        try:
+            stat = Path(audio_file).stat()
+        except OSError:
+            return None
+
+        key_str = (f"{Path(audio_file).resolve()}_{stat.st_size}_{stat.st_mtime_ns}_"
+                   f"{audio_duration:.3f}_{fade_in}_{fade_out}")
+        cached_file = cache_dir / f"audio_{hashlib.md5(key_str.encode()).hexdigest()[:12]}.m4a"
+
+        if cached_file.exists():
+            self.logger.info(f"Reusing pre-faded audio: {cached_file.name}")
+            os.utime(cached_file)  # Mark as recently used for eviction
+            return str(cached_file)
+
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        partial_file = cached_file.with_name(f"{cached_file.stem}.partial.m4a")
+        cmd = [
+            'ffmpeg', '-y',
+            '-i', audio_file,
+            '-vn',
+            '-af', self._audio_fade_filter(audio_duration, fade_in, fade_out),
+            '-c:a', 'aac',
+            '-b:a', '320k',
+            str(partial_file)
+        ]
+
+        self.logger.info("Encoding faded audio track (cached for later renders)...")
+        result = subprocess.run(cmd, capture_output=True, text=True,
+                                encoding='utf-8', errors='replace',
+                                bufsize=_PIPE_BUFSIZE)
+        if result.returncode != 0 or not partial_file.exists():
+            self.logger.warning(f"Audio pre-render failed, encoding inline: {result.stderr}")
+            if partial_file.exists():
+                partial_file.unlink()
+            return None
+
+        partial_file.replace(cached_file)
+        self._evict_cached_audio(cache_dir)
+        return str(cached_file)
+
+    def _evict_cached_audio(self, cache_dir: Path) -> None:
+        """Delete all but the MAX_CACHED_AUDIO_TRACKS most recently used pre-faded tracks"""
+        try:
+            with os.scandir(cache_dir) as it:
+                tracks = [entry for entry in it
+                          if entry.name.startswith('audio_')
+                          and not entry.name.endswith('.partial.m4a')  # Encode in progress
+                          and entry.is_file()]
+            tracks.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+            for stale in tracks[MAX_CACHED_AUDIO_TRACKS:]:
+                os.remove(stale.path)
+                self.logger.debug(f"Evicted cached audio: {stale.name}")
+        except OSError as e:
+            self.logger.warning(f"Could not clean audio cache {cache_dir}: {e}")
+
+    def _get_audio_codec(self, file_path: str) -> Optional[str]:
+        """Get the codec name of the first audio stream using ffprobe"""
+        cmd = [
+            'ffprobe',
+            '-v', 'error',
+            '-select_streams', 'a:0',
+            '-show_entries', 'stream=codec_name',
+            '-of', 'default=noprint_wrappers=1:nokey=1',
+            file_path
+        ]
+
+        try:
+            result = subprocess.run(cmd, capture_output=True, check=True,
+                                    bufsize=_PIPE_BUFSIZE)
+            return result.stdout.strip().decode('ascii') or None
+        except Exception as e:
+            self.logger.warning(f"Could not get audio codec for {file_path}: {e}")
+            return None
+
     def _get_duration(self, file_path: str) -> float:
         """Get media file duration using ffprobe"""
         cmd = [
             'ffprobe',
             '-v', 'error',
             '-show_entries', 'format=duration',
-            '-of', 'json',
+            '-of', 'default=noprint_wrappers=1:nokey=1',
             file_path
         ]
         
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            data = json.loads(result.stdout)
-            return float(data['format']['duration'])
+            # Single bare value on stdout - no JSON or text decoding needed
+            result = subprocess.run(cmd, capture_output=True, check=True,
+                                    bufsize=_PIPE_BUFSIZE)
+            return float(result.stdout.strip())
         except Exception as e:
             self.logger.warning(f"Could not get duration for {file_path}: {e}")
             return 0.0
@@ -365,10 +849,40 @@ class SegmentRenderer:
 class SegmentFilterBuilder:
     """Builds FFmpeg filters for individual video segments"""
     
-    def __init__(self, resolution: tuple, fps: int, logger):
+    def __init__(self, resolution: tuple, fps: int, logger, hw: Optional[str] = None):
+        """
+        Initialize segment filter builder
+
+        Args:
+            resolution: (width, height) tuple
+            fps: Frames per second
+            logger: Logger instance
+            hw: Hardware acceleration ('cuda' or None for CPU filters)
+        """
         self.width, self.height = resolution
         self.fps = fps
         self.logger = logger
+        self.hw = None
+
+        if hw == 'cuda':
+            if utils.check_cuda_filters():
+                self.hw = 'cuda'
+                self.logger.info("Using CUDA filters for scale/blur/overlay")
+            else:
+                self.logger.warning("CUDA filters not available in FFmpeg, using CPU filters")
+        elif hw:
+            self.logger.warning(f"Unknown hardware acceleration '{hw}', using CPU filters")
+
+        # Filter templates keyed by is_portrait: resolution/fps/hw are fixed per
+        # builder, so only the input label and per-image fields vary per segment
+        self._static_templates = {}
+        self._kb_templates = {}
+        for is_portrait in (False, True):
+            base = self._build_base_filter(is_portrait)
+            # Add trim to ensure exact duration for static images too
+            self._static_templates[is_portrait] = base + ",trim=duration={duration}"
+            self._kb_templates[is_portrait] = base + ",{kb}"
+        self._output_tail = f",fps={self.fps},settb=1/{self.fps}[out]"
     
     def build_image_filter(
         self,
@@ -402,9 +916,57 @@ class SegmentFilterBuilder:
         filter_str = grader.apply_to_filter_chain(filter_str)
         
         # Set framerate and output
-        filter_str += f",fps={self.fps},settb=1/{self.fps}[out]"
+        filter_str += self._output_tail
         
         return filter_str
+
+    def build_batch_filter(self, image_filters: List[str]) -> str:
+        """
+        Combine single-image filters into one graph for a batched render
+
+        Chain i reads input [i:v], its internal labels get an index suffix so
+        chains don't collide, and all chains are concatenated into [out].
+
+        Args:
+            image_filters: Filters from build_image_filter, in playback order
+
+        Returns:
+            Complete filter string for the batch
+        """
+        chains = []
+        for i, filter_str in enumerate(image_filters):
+            chains.append(_LINK_LABEL_RE.sub(
+                lambda m: f"[{i}:v]" if m.group(1) == '0:v' else f"[{m.group(1)}{i}]",
+                filter_str
+            ))
+
+        concat_inputs = ''.join(f"[out{i}]" for i in range(len(image_filters)))
+        chains.append(f"{concat_inputs}concat=n={len(image_filters)}:v=1:a=0[out]")
+        return ';'.join(chains)
+
+    def is_static_copyable(
+        self,
+        metadata: utils.ImageMetadata,
+        grader: color_grading.ColorGrader
+    ) -> bool:
+        """
+        Check whether every frame of this image segment is identical
+
+        Landscape images without Ken Burns produce the same frame for the whole
+        segment, unless film grain adds per-frame noise.
+
+        Args:
+            metadata: Image metadata
+            grader: Color grading processor
+
+        Returns:
+            True if the segment can be rendered as one frame + stream copy
+        """
+        return (
+            not metadata.use_ken_burns
+            and not metadata.is_portrait
+            and not grader.config.film_grain
+        )
     
     def _build_ken_burns_filter(
         self,
@@ -413,43 +975,34 @@ class SegmentFilterBuilder:
         input_label: str
     ) -> str:
         """Build filter with Ken Burns effect"""
-        kb_config = meta.ken_burns_type
-        
-        if meta.is_portrait:
-            # Portrait: blur background + Ken Burns on foreground
-            filter_str = (
-                f"[{input_label}]format=yuv420p,split=2[blur][img];"
-                f"[blur]scale={self.width}:{self.height}:"
-                f"force_original_aspect_ratio=increase,"
-                f"crop={self.width}:{self.height},gblur=sigma=20[bg];"
-                f"[img]scale={self.width}:{self.height}:"
-                f"force_original_aspect_ratio=decrease[fg];"
-                f"[bg][fg]overlay=(W-w)/2:(H-h)/2"
-            )
-        else:
-            # Landscape: simple scale with padding
-            filter_str = (
-                f"[{input_label}]format=yuv420p,"
-                f"scale={self.width}:{self.height}:"
-                f"force_original_aspect_ratio=decrease,"
-                f"pad={self.width}:{self.height}:(ow-iw)/2:(oh-ih)/2:black"
-            )
-        
-        # Add Ken Burns effect
         kb_filter = ken_burns.create_ken_burns_filter(
-            kb_config, meta.duration, self.fps,
+            meta.ken_burns_type, meta.duration, self.fps,
             self.width, self.height
         )
-        filter_str += f",{kb_filter}"
-        
-        return filter_str
+        return self._kb_templates[meta.is_portrait].format(
+            input=input_label, kb=kb_filter
+        )
     
     def _build_static_filter(self, meta: utils.ImageMetadata, input_label: str) -> str:
         """Build filter without Ken Burns effect - includes trim for exact duration"""
-        if meta.is_portrait:
-            # Portrait with blurred background
-            filter_str = (
-                f"[{input_label}]format=yuv420p,split=2[blur][img];"
+        return self._static_templates[meta.is_portrait].format(
+            input=input_label, duration=meta.duration
+        )
+
+    def _build_base_filter(self, is_portrait: bool) -> str:
+        """
+        Build the scale/pad (landscape) or blur/overlay (portrait) stage
+
+        Returns:
+            Filter string with an {input} placeholder for the input label
+        """
+        if self.hw == 'cuda':
+            return self._build_cuda_base_filter(is_portrait)
+
+        if is_portrait:
+            # Portrait: blurred background + centered foreground
+            return (
+                f"[{{input}}]format=yuv420p,split=2[blur][img];"
                 f"[blur]scale={self.width}:{self.height}:"
                 f"force_original_aspect_ratio=increase,"
                 f"crop={self.width}:{self.height},gblur=sigma=20[bg];"
@@ -457,16 +1010,42 @@ class SegmentFilterBuilder:
                 f"force_original_aspect_ratio=decrease[fg];"
                 f"[bg][fg]overlay=(W-w)/2:(H-h)/2"
             )
-        else:
-            # Landscape with simple padding
-            filter_str = (
-                f"[{input_label}]format=yuv420p,"
-                f"scale={self.width}:{self.height}:"
-                f"force_original_aspect_ratio=decrease,"
-                f"pad={self.width}:{self.height}:(ow-iw)/2:(oh-ih)/2:black"
+
+        # Landscape: simple scale with padding
+        return (
+            f"[{{input}}]format=yuv420p,"
+            f"scale={self.width}:{self.height}:"
+            f"force_original_aspect_ratio=decrease,"
+            f"pad={self.width}:{self.height}:(ow-iw)/2:(oh-ih)/2:black"
+        )
+
+    def _build_cuda_base_filter(self, is_portrait: bool) -> str:
+        """
+        Build the scale/blur/overlay stage on the GPU
+
+        Frames are uploaded once, processed with scale_cuda, bilateral_cuda and
+        overlay_cuda, then downloaded so the rest of the chain (crop, pad,
+        zoompan, color grading) keeps running on CPU filters.
+        """
+        if is_portrait:
+            # Portrait: blurred background + centered foreground, composited on device
+            return (
+                f"[{{input}}]format=nv12,hwupload_cuda,split=2[blur][img];"
+                f"[blur]scale_cuda={self.width}:{self.height}:"
+                f"force_original_aspect_ratio=increase,"
+                f"hwdownload,format=nv12,crop={self.width}:{self.height},"
+                f"hwupload_cuda,bilateral_cuda=window_size=41:sigmaS=20:sigmaR=0.5[bg];"
+                f"[img]scale_cuda={self.width}:{self.height}:"
+                f"force_original_aspect_ratio=decrease[fg];"
+                f"[bg][fg]overlay_cuda=x=(W-w)/2:y=(H-h)/2,"
+                f"hwdownload,format=nv12,format=yuv420p"
             )
-        
-        # Add trim to ensure exact duration for static images too
-        filter_str += f",trim=duration={meta.duration}"
-        
-        return filter_str
\ No newline at end of file
+
+        # Landscape: scale on device, pad on CPU (no CUDA pad filter)
+        return (
+            f"[{{input}}]format=nv12,hwupload_cuda,"
+            f"scale_cuda={self.width}:{self.height}:"
+            f"force_original_aspect_ratio=decrease,"
+            f"hwdownload,format=nv12,format=yuv420p,"
+            f"pad={self.width}:{self.height}:(ow-iw)/2:(oh-ih)/2:black"
+        )
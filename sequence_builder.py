@@ -5,13 +5,99 @@ Sequence Builder Module
 Creates opening and closing sequences with Hebrew text overlays
 """
 
+import os
+import re
 import tempfile
+from dataclasses import dataclass
 from pathlib import Path
+from typing import List, Optional
+
+try:
+    from PIL import Image, ImageDraw, ImageFont, ImageColor, features
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+# drawtext position variables -> overlay equivalents (main video W/H, text image w/h)
+_DRAWTEXT_TO_OVERLAY_VARS = {
+    'w': 'W', 'h': 'H', 'W': 'W', 'H': 'H',
+    'text_w': 'w', 'text_h': 'h', 'tw': 'w', 'th': 'h',
+}
+_POSITION_VAR_PATTERN = re.compile(r'\b(text_w|text_h|tw|th|w|h|W|H)\b')
+
+# Windows path -> FFmpeg filter option: forward slashes, colons escaped for
+# both the filtergraph and option parsers (double backslash)
+_FILTER_PATH_TABLE = str.maketrans({'\\': '/', ':': '\\\\:'})
+
+
+@dataclass(frozen=True)
+class TextOverlaySpec:
+    """Parsed settings for one text layer (main text or subtitle)"""
+    text: str
+    font: str
+    fontsize: int
+    fontcolor: str
+    text_shaping: int
+    x: str
+    y: Optional[str]
+    y_offset: Optional[int]
+    shadow_color: str
+    shadow_x: int
+    shadow_y: int
+    fade_in: float
+    fade_out: float
+
+    @classmethod
+    def from_dict(cls, config: dict, fontsize: int = 48, y: Optional[str] = None,
+                  fade_in: float = 1.0, fade_out: float = 1.5) -> 'TextOverlaySpec':
+        """
+        Build a spec from a text overlay config section
+
+        Args:
+            config: Text configuration dictionary
+            fontsize: Default font size
+            y: Default Y expression (None = positioned from base_y)
+            fade_in: Default fade in duration
+            fade_out: Default fade out duration
+
+        Returns:
+            TextOverlaySpec instance
+        """
+        position = config.get('position', {})
+        shadow = config.get('shadow', {})
+        effects = config.get('effects', {})
+
+        return cls(
+            text=config.get('text', ''),
+            font=config.get('font', 'C:/Windows/Fonts/arial.ttf'),
+            fontsize=config.get('fontsize', fontsize),
+            fontcolor=config.get('fontcolor', 'white'),
+            text_shaping=config.get('text_shaping', 1),  # Enable by default for RTL support
+            x=position.get('x', '(w-text_w)/2'),
+            y=position.get('y', y),
+            y_offset=position.get('y_offset'),
+            shadow_color=shadow.get('color', 'black@0.6'),
+            shadow_x=shadow.get('x', 3),
+            shadow_y=shadow.get('y', 3),
+            fade_in=effects.get('fade_in', fade_in),
+            fade_out=effects.get('fade_out', fade_out),
+        )
+
+    def y_position(self, base_y: int) -> str:
+        """Resolve the Y position expression against a base Y (pixels)"""
+        if self.y is not None:
+            return self.y
+        if self.y_offset is not None:
+            return str(base_y + self.y_offset)
+        return str(base_y)
 
 
 class SequenceBuilder:
     """Builds opening and closing sequences with text overlays"""
 
+    # Special characters for FFmpeg drawtext escaping
+    _ESCAPE_TABLE = str.maketrans({'\\': '\\\\', ':': '\\:', ',': '\\,'})
+
     def __init__(self, resolution: tuple, fps: int, text_config: dict, logger):
         """
         Initialize sequence builder with text overlay configuration
@@ -27,9 +113,41 @@ class SequenceBuilder:
         self.text_config = text_config
         self.logger = logger
 
+        # Sequence filter template, fixed per builder: only the input index,
+        # text overlays, duration and output label vary per call
+        self._sequence_template = (
+            f"[{{input}}:v]"
+            f"scale={self.width}:{self.height}:force_original_aspect_ratio=decrease,"
+            f"pad={self.width}:{self.height}:(ow-iw)/2:(oh-ih)/2:black,"
+            f"{{text}}"
+            f"trim=duration={{duration}},"  # Ensure exact duration
+            f"fps={self.fps},settb=1/{self.fps}"
+            f"[{{label}}]"
+        )
+
+        # Parse text layers once; the config does not change between segments
+        opening_main = text_config.get('opening', {}).get('main', {})
+        self.opening_spec = TextOverlaySpec.from_dict(
+            {'text': 'Title', **opening_main},
+            fontsize=72, y='(h-text_h)/2', fade_in=0.5, fade_out=0.5
+        )
+        closing_config = text_config.get('closing', {})
+        closing_main = closing_config.get('main', {})
+        self.closing_specs: List[TextOverlaySpec] = (
+            [TextOverlaySpec.from_dict(closing_main)] if closing_main else []
+        )
+        self.closing_specs.extend(
+            TextOverlaySpec.from_dict(subtitle)
+            for subtitle in closing_config.get('subtitles', [])
+        )
+
         # Track temporary text files for cleanup
         self.temp_text_files = []
 
+        # Rasterized text images: (text, font, size, color, shadow) -> escaped PNG path
+        self._text_image_cache = {}
+        self._text_overlay_count = 0
+
     def create_text_file(self, text: str) -> str:
         """
         Create a temporary UTF-8 text file for FFmpeg textfile parameter
@@ -41,23 +159,19 @@ class SequenceBuilder:
         Returns:
             Path to the temporary text file (FFmpeg-escaped)
         """
-        # Create temp file with UTF-8 encoding
-        fd, temp_path = tempfile.mkstemp(suffix='.txt', text=True)
-        try:
-            with open(temp_path, 'w', encoding='utf-8') as f:
-                f.write(text)
-            # Track for cleanup
-            self.temp_text_files.append(temp_path)
-            # Convert to forward slashes and escape colons for FFmpeg filter parameters
-            # Use double backslash for Windows command-line escaping
-            return temp_path.replace("\\", "/").replace(":", "\\\\:")
-        finally:
-            import os
-            os.close(fd)
+        # Create temp file with UTF-8 encoding (single open, closed before FFmpeg reads it)
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', encoding='utf-8',
+                                         delete=False) as f:
+            f.write(text)
+            temp_path = f.name
+        # Track for cleanup
+        self.temp_text_files.append(temp_path)
+        # Convert to forward slashes and escape colons for FFmpeg filter parameters
+        # Use double backslash for Windows command-line escaping
+        return temp_path.translate(_FILTER_PATH_TABLE)
 
     def cleanup_temp_files(self):
         """Remove temporary text files"""
-        import os
         for temp_file in self.temp_text_files:
             try:
                 if os.path.exists(temp_file):
@@ -67,7 +181,8 @@ class SequenceBuilder:
                     self.logger.warning(f"Failed to remove temp file {temp_file}: {e}")
         self.temp_text_files.clear()
 
-    def create_opening_part1(self, input_index: int, duration: float) -> tuple:
+    def create_opening_part1(self, input_index: int, duration: float,
+                             out_label: str = "opening_part1") -> tuple:
         """
         Create opening sequence part 1: Special photo only (0-3s)
         FIXED: Added trim filter for exact duration
@@ -75,26 +190,21 @@ class SequenceBuilder:
         Args:
             input_index: FFmpeg input index for the special photo
             duration: Duration in seconds
+            out_label: Output link label for the filter chain
             
         Returns:
             (filter_string, output_label)
         """
-        filter_str = (
-            f"[{input_index}:v]"
-            f"scale={self.width}:{self.height}:force_original_aspect_ratio=decrease,"
-            f"pad={self.width}:{self.height}:(ow-iw)/2:(oh-ih)/2:black,"
-            f"trim=duration={duration},"  # ADDED: Ensure exact duration
-            f"fps={self.fps},settb=1/{self.fps}"
+        filter_str = self._sequence_template.format(
+            input=input_index, text="", duration=duration, label=out_label
         )
         
-        output_label = "opening_part1"
-        filter_str += f"[{output_label}]"
-        
         self.logger.info(f"Created opening part 1 (special photo only): {duration}s")
         
-        return filter_str, output_label
+        return filter_str, out_label
     
-    def create_opening_part2(self, input_index: int, duration: float) -> tuple:
+    def create_opening_part2(self, input_index: int, duration: float,
+                             out_label: str = "opening_part2") -> tuple:
         """
         Create opening sequence part 2: Special photo + text overlay
         FIXED: Added trim filter for exact duration
@@ -102,6 +212,7 @@ class SequenceBuilder:
         Args:
             input_index: FFmpeg input index for the special photo
             duration: Duration in seconds
+            out_label: Output link label for the filter chain
 
         Returns:
             (filter_string, output_label)
@@ -110,70 +221,22 @@ class SequenceBuilder:
 
         if not opening_config.get('enabled', True):
             # No text overlay, just return scaled image with trim
-            return self.create_opening_part1(input_index, duration)
-
-        main_config = opening_config.get('main', {})
-
-        # Get text and font settings from config
-        main_text = main_config.get('text', 'Title')
-        font_path = main_config.get('font', 'C:/Windows/Fonts/arial.ttf')
-        fontsize = main_config.get('fontsize', 72)
-        fontcolor = main_config.get('fontcolor', 'white')
-        text_shaping = main_config.get('text_shaping', 1)
-
-        # Position settings
-        position = main_config.get('position', {})
-        x_pos = position.get('x', '(w-text_w)/2')
-        y_pos = position.get('y', '(h-text_h)/2')
-
-        # Shadow settings
-        shadow = main_config.get('shadow', {})
-        shadow_color = shadow.get('color', 'black@0.6')
-        shadow_x = shadow.get('x', 3)
-        shadow_y = shadow.get('y', 3)
-
-        # Fade effects
-        effects = main_config.get('effects', {})
-        fade_in = effects.get('fade_in', 0.5)
-        fade_out = effects.get('fade_out', 0.5)
-
-        # Create text file for text (avoids Windows Unicode issues)
-        text_file_path = self.create_text_file(main_text)
-
-        # Convert Windows path to FFmpeg format and escape colons
-        font_path_escaped = font_path.replace("\\", "/").replace(":", "\\\\:")
-        shadow_color_escaped = shadow_color.replace("@", "\\\\@")
-
-        filter_str = (
-            f"[{input_index}:v]"
-            f"scale={self.width}:{self.height}:force_original_aspect_ratio=decrease,"
-            f"pad={self.width}:{self.height}:(ow-iw)/2:(oh-ih)/2:black,"
-
-            # Add main text with fade effects
-            f"drawtext="
-            f"fontfile={font_path_escaped}:"
-            f"textfile={text_file_path}:"
-            f"fontsize={fontsize}:"
-            f"fontcolor={fontcolor}:"
-            f"x={x_pos}:"
-            f"y={y_pos}:"
-            f"shadowcolor={shadow_color_escaped}:"
-            f"shadowx={shadow_x}:"
-            f"shadowy={shadow_y}:"
-            f"text_shaping={text_shaping}:"
-            f"alpha=if(lt(t\\,{fade_in})\\,t/{fade_in}\\,if(lt(t\\,{duration-fade_out})\\,1\\,(1-(t-{duration-fade_out})/{fade_out}))),"
-            f"trim=duration={duration},"  # ADDED: Ensure exact duration
-            f"fps={self.fps},settb=1/{self.fps}"
+            return self.create_opening_part1(input_index, duration, out_label)
+
+        # Add main text with fade effects
+        filter_str = self._sequence_template.format(
+            input=input_index,
+            text=self._build_text_overlay(self.opening_spec, self.height // 2, duration),
+            duration=duration,
+            label=out_label
         )
 
-        output_label = "opening_part2"
-        filter_str += f"[{output_label}]"
-
         self.logger.info(f"Created opening part 2 with text overlay: {duration}s")
 
-        return filter_str, output_label
+        return filter_str, out_label
     
-    def create_closing_sequence(self, input_index: int, duration: float) -> tuple:
+    def create_closing_sequence(self, input_index: int, duration: float,
+                                out_label: str = "closing") -> tuple:
         """
         Create closing sequence: Special photo + text overlay
         FIXED: Added trim filter for exact duration
@@ -182,6 +245,7 @@ class SequenceBuilder:
         Args:
             input_index: FFmpeg input index for the special photo
             duration: Duration in seconds
+            out_label: Output link label for the filter chain
 
         Returns:
             (filter_string, output_label)
@@ -190,128 +254,191 @@ class SequenceBuilder:
 
         if not closing_config.get('enabled', True):
             # No text overlay, just return scaled image with trim
-            filter_str = (
-                f"[{input_index}:v]"
-                f"scale={self.width}:{self.height}:force_original_aspect_ratio=decrease,"
-                f"pad={self.width}:{self.height}:(ow-iw)/2:(oh-ih)/2:black,"
-                f"trim=duration={duration},"  # ADDED: Ensure exact duration
-                f"fps={self.fps},settb=1/{self.fps}"
-                f"[closing]"
+            filter_str = self._sequence_template.format(
+                input=input_index, text="", duration=duration, label=out_label
             )
-            return filter_str, "closing"
+            return filter_str, out_label
 
         # Get base position (percentage from top)
         base_position = closing_config.get('base_position', {})
         base_y_frac = base_position.get('y', 0.5)
         base_y = int(self.height * base_y_frac)
 
-        # Start building filter
-        filter_str = (
-            f"[{input_index}:v]"
-            f"scale={self.width}:{self.height}:force_original_aspect_ratio=decrease,"
-            f"pad={self.width}:{self.height}:(ow-iw)/2:(oh-ih)/2:black,"
+        # Add main text and subtitles
+        text_overlays = ''.join(
+            self._build_text_overlay(spec, base_y, duration) for spec in self.closing_specs
+        )
+        filter_str = self._sequence_template.format(
+            input=input_index, text=text_overlays, duration=duration, label=out_label
         )
-
-        # Add main text
-        main_config = closing_config.get('main', {})
-        if main_config:
-            filter_str += self._build_text_overlay(
-                main_config,
-                base_y,
-                duration
-            )
-
-        # Add subtitles
-        subtitles = closing_config.get('subtitles', [])
-        for subtitle_config in subtitles:
-            filter_str += self._build_text_overlay(
-                subtitle_config,
-                base_y,
-                duration
-            )
-
-        # Add trim filter and final filters
-        filter_str += f"trim=duration={duration},"  # ADDED: Ensure exact duration
-        filter_str += f"fps={self.fps},settb=1/{self.fps}[closing]"
 
         self.logger.info(f"Created closing sequence with text overlay: {duration:.1f}s")
 
-        return filter_str, "closing"
+        return filter_str, out_label
 
 
-    def _build_text_overlay(self, text_config: dict, base_y: int, duration: float) -> str:
+    def _build_text_overlay(self, spec: TextOverlaySpec, base_y: int, duration: float) -> str:
         """
-        Build a drawtext filter string from text configuration
+        Build a drawtext filter string from a text overlay spec
 
         Args:
-            text_config: Text configuration dictionary
+            spec: Parsed text overlay settings
             base_y: Base Y position (pixels)
             duration: Total duration for fade calculations
 
         Returns:
             FFmpeg drawtext filter string
         """
-        # Get text and font settings
-        text = text_config.get('text', '')
-        if not text:
+        if not spec.text:
             return ""
 
-        font_path = text_config.get('font', 'C:/Windows/Fonts/arial.ttf')
-        fontsize = text_config.get('fontsize', 48)
-        fontcolor = text_config.get('fontcolor', 'white')
-        text_shaping = text_config.get('text_shaping', 1)  # Enable by default for RTL support
-
-        # Position settings
-        position = text_config.get('position', {})
-        x_pos = position.get('x', '(w-text_w)/2')
-
-        # Calculate Y position
-        if 'y' in position:
-            y_pos = position['y']
-        elif 'y_offset' in position:
-            y_offset = position['y_offset']
-            y_pos = str(base_y + y_offset)
-        else:
-            y_pos = str(base_y)
-
-        # Shadow settings
-        shadow = text_config.get('shadow', {})
-        shadow_color = shadow.get('color', 'black@0.6')
-        shadow_x = shadow.get('x', 3)
-        shadow_y = shadow.get('y', 3)
-
-        # Fade effects
-        effects = text_config.get('effects', {})
-        fade_in = effects.get('fade_in', 1.0)
-        fade_out = effects.get('fade_out', 1.5)
+        y_pos = spec.y_position(base_y)
+        fade_in = spec.fade_in
+        fade_out = spec.fade_out
         fade_out_start = duration - fade_out
 
-        # Create text file
-        text_file_path = self.create_text_file(text)
+        # Prefer a pre-rendered text image over per-frame drawtext shaping
+        text_overlay = self._build_text_image_overlay(spec, y_pos, duration)
+        if text_overlay:
+            return text_overlay
+
+        # Create text file (avoids Windows Unicode issues)
+        text_file_path = self.create_text_file(spec.text)
 
         # Escape paths and colors
-        font_path_escaped = font_path.replace("\\", "/").replace(":", "\\\\:")
-        shadow_color_escaped = shadow_color.replace("@", "\\\\@")
+        font_path_escaped = spec.font.translate(_FILTER_PATH_TABLE)
+        shadow_color_escaped = spec.shadow_color.replace("@", "\\\\@")
 
         # Build drawtext filter
         drawtext = (
             f"drawtext="
             f"fontfile={font_path_escaped}:"
             f"textfile={text_file_path}:"
-            f"fontsize={fontsize}:"
-            f"fontcolor={fontcolor}:"
-            f"x={x_pos}:"
+            f"fontsize={spec.fontsize}:"
+            f"fontcolor={spec.fontcolor}:"
+            f"x={spec.x}:"
             f"y={y_pos}:"
             f"shadowcolor={shadow_color_escaped}:"
-            f"shadowx={shadow_x}:"
-            f"shadowy={shadow_y}:"
-            f"text_shaping={text_shaping}:"
+            f"shadowx={spec.shadow_x}:"
+            f"shadowy={spec.shadow_y}:"
+            f"text_shaping={spec.text_shaping}:"
             f"alpha=if(lt(t\\,{fade_in})\\,t/{fade_in}\\,"
             f"if(lt(t\\,{fade_out_start})\\,1\\,(1-(t-{fade_out_start})/{fade_out}))),"
         )
 
         return drawtext
     
+    def _build_text_image_overlay(self, spec: TextOverlaySpec, y_pos: str,
+                                  duration: float) -> str:
+        """
+        Build an overlay of a pre-rendered text image, continuing a linear filter chain
+
+        The text is shaped and rasterized once, looped in memory and blended
+        with overlay, instead of drawtext re-shaping it on every frame.
+
+        Returns:
+            Filter fragment ending with ',' or "" if the text could not be
+            rasterized (caller falls back to drawtext)
+        """
+        image_path = self._rasterize_text(spec)
+        if not image_path:
+            return ""
+
+        index = self._text_overlay_count
+        self._text_overlay_count += 1
+        base_label = f"txt_base{index}"
+        text_label = f"txt{index}"
+
+        x_expr = self._to_overlay_position(spec.x)
+        y_expr = self._to_overlay_position(y_pos)
+        fade_in = spec.fade_in
+        fade_out = spec.fade_out
+        fade_out_start = duration - fade_out
+
+        return (
+            f"null[{base_label}];"
+            f"movie={image_path},loop=loop=-1:size=1,"
+            f"setpts=N/({self.fps}*TB),format=rgba,"
+            f"fade=t=in:st=0:d={fade_in}:alpha=1,"
+            f"fade=t=out:st={fade_out_start}:d={fade_out}:alpha=1[{text_label}];"
+            f"[{base_label}][{text_label}]overlay=x={x_expr}:y={y_expr}:format=auto,"
+        )
+
+    def _rasterize_text(self, spec: TextOverlaySpec) -> Optional[str]:
+        """
+        Render text (with drop shadow) to a transparent PNG sized to its bounding box
+
+        Uses Pillow's Raqm layout (HarfBuzz + FriBiDi) for shaped RTL text,
+        so shaping is only attempted when Raqm is available.
+
+        Returns:
+            FFmpeg-escaped PNG path, or None if rasterization is unavailable
+        """
+        if not PIL_AVAILABLE:
+            return None
+        if spec.text_shaping and not features.check('raqm'):
+            return None
+
+        cache_key = (spec.text, spec.font, spec.fontsize, spec.fontcolor,
+                     spec.text_shaping, spec.shadow_color, spec.shadow_x, spec.shadow_y)
+        if cache_key in self._text_image_cache:
+            return self._text_image_cache[cache_key]
+
+        text = spec.text
+        try:
+            layout = ImageFont.Layout.RAQM if spec.text_shaping else ImageFont.Layout.BASIC
+            font = ImageFont.truetype(spec.font, int(spec.fontsize), layout_engine=layout)
+            fill = self._parse_color(spec.fontcolor)
+            shadow_fill = self._parse_color(spec.shadow_color)
+
+            left, top, right, bottom = font.getbbox(text)
+            text_w, text_h = right - left, bottom - top
+            shadow_x, shadow_y = int(spec.shadow_x), int(spec.shadow_y)
+
+            image = Image.new(
+                'RGBA',
+                (text_w + abs(shadow_x), text_h + abs(shadow_y)),
+                (0, 0, 0, 0)
+            )
+            draw = ImageDraw.Draw(image)
+            origin_x = max(-shadow_x, 0) - left
+            origin_y = max(-shadow_y, 0) - top
+            draw.text((origin_x + shadow_x, origin_y + shadow_y), text,
+                      font=font, fill=shadow_fill)
+            draw.text((origin_x, origin_y), text, font=font, fill=fill)
+
+            with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as f:
+                image.save(f, format='PNG')
+                temp_path = f.name
+            self.temp_text_files.append(temp_path)
+
+        except (OSError, ValueError) as e:
+            if self.logger:
+                self.logger.warning(f"Could not rasterize text, using drawtext: {e}")
+            return None
+
+        escaped_path = temp_path.translate(_FILTER_PATH_TABLE)
+        self._text_image_cache[cache_key] = escaped_path
+        return escaped_path
+
+    @staticmethod
+    def _parse_color(color: str) -> tuple:
+        """Convert an FFmpeg color ('white', '#RRGGBB', 'black@0.6') to RGBA"""
+        name, _, alpha = str(color).partition('@')
+        if name.lower().startswith('0x'):
+            name = '#' + name[2:]
+        rgba = ImageColor.getcolor(name, 'RGBA')
+        if alpha:
+            rgba = rgba[:3] + (int(float(alpha) * 255),)
+        return rgba
+
+    @staticmethod
+    def _to_overlay_position(expr) -> str:
+        """Translate a drawtext x/y expression to overlay variables"""
+        return _POSITION_VAR_PATTERN.sub(
+            lambda m: _DRAWTEXT_TO_OVERLAY_VARS[m.group(1)], str(expr)
+        )
+
     def escape_text_for_ffmpeg(self, text: str) -> str:
         """
         Escape special characters for FFmpeg drawtext filter
@@ -323,17 +450,6 @@ class SequenceBuilder:
         Returns:
             Escaped text safe for FFmpeg
         """
-        # For FFmpeg drawtext filter, escape special characters
-        # Order matters: backslashes first, then other chars
-
-        # 1. Escape backslashes FIRST (before anything else)
-        text = text.replace("\\", "\\\\")
-
-        # 2. Escape colons (parameter separators in FFmpeg filters)
-        text = text.replace(":", "\\:")
-
-        # 3. Escape commas (can cause parsing issues)
-        text = text.replace(",", "\\,")
-
-        # Don't use quotes - just return escaped text
-        return text
\ No newline at end of file
+        # Backslashes, colons (parameter separators) and commas (filter
+        # separators) are escaped in a single pass - don't use quotes
+        return text.translate(self._ESCAPE_TABLE)
\ No newline at end of file
@@ -5,8 +5,9 @@ Simple HTTP server to serve the web configuration builder
 Opens browser automatically to the configuration interface
 """
 
+import gzip
 import http.server
-import socketserver
+import socket
 import webbrowser
 import os
 import sys
@@ -15,20 +16,62 @@ from pathlib import Path
 PORT = 8000
 HOST = 'localhost'
 
+HTML_PATHS = ('/', '/web_config_builder.html')
+
+
+class ConfigBuilderServer(http.server.ThreadingHTTPServer):
+    """Threaded HTTP server with Nagle disabled on accepted connections"""
+
+    allow_reuse_address = True
+
+    def get_request(self):
+        """Accept a connection and send small responses without delay"""
+        conn, addr = super().get_request()
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return conn, addr
+
+
 class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
     """Custom handler to serve the config builder"""
 
+    # Config builder page, loaded once by main() (raw and gzip-compressed)
+    html_bytes = None
+    html_gzip = None
+
     def __init__(self, *args, **kwargs):
         # Set the directory to serve files from
         super().__init__(*args, directory=str(Path(__file__).parent), **kwargs)
 
     def do_GET(self):
         """Handle GET requests"""
+        # Serve the config builder from memory
+        if self.path in HTML_PATHS and self.html_bytes is not None:
+            return self._send_html()
+
         # Redirect root to the config builder
         if self.path == '/':
             self.path = '/web_config_builder.html'
         return super().do_GET()
 
+    def _send_html(self):
+        """Send the cached config builder page, gzipped if the client accepts it"""
+        use_gzip = 'gzip' in self.headers.get('Accept-Encoding', '')
+        body = self.html_gzip if use_gzip else self.html_bytes
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'public, max-age=300')
+        self.send_header('Vary', 'Accept-Encoding')
+        if use_gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        """Client address for logs (no reverse DNS lookup)"""
+        return self.client_address[0]
+
     def log_message(self, format, *args):
         """Custom log format"""
         print(f"[SERVER] {args[0]}")
@@ -44,9 +87,14 @@ def main():
         print(f"   Expected at: {html_file}")
         return 1
 
+    # The page is static while the server runs - read and compress it once
+    CustomHTTPRequestHandler.html_bytes = html_file.read_bytes()
+    CustomHTTPRequestHandler.html_gzip = gzip.compress(CustomHTTPRequestHandler.html_bytes, 6)
+
     try:
-        # Create server
-        with socketserver.TCPServer((HOST, PORT), CustomHTTPRequestHandler) as httpd:
+        # Create server (one thread per connection, so a keep-alive
+        # connection cannot block the page's other asset requests)
+        with ConfigBuilderServer((HOST, PORT), CustomHTTPRequestHandler) as httpd:
             url = f"http://{HOST}:{PORT}"
 
             print("=" * 70)
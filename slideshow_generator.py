@@ -6,10 +6,12 @@ Memory-efficient approach: renders one segment at a time
 Handles unlimited images without memory issues
 """
 
+import os
 import time
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Sequence, Tuple
 
 import utils
 import ken_burns
@@ -20,6 +22,10 @@ from sequence_builder import SequenceBuilder
 from segment_renderer import SegmentRenderer, SegmentFilterBuilder
 from config import ProjectConfig
 
+# Distinct overlays rendered per (duration, windows) in random particle mode;
+# further segments reuse them round-robin instead of rendering new ones
+OVERLAY_POOL_SIZE = 3
+
 
 class SlideshowGenerator:
     """Main slideshow generator class using segment-based rendering"""
@@ -45,6 +51,8 @@ class SlideshowGenerator:
         self.fps = video_settings['fps']
         self.crf = video_settings['crf']
         self.preset = video_settings['preset']
+        self.hwaccel = video_settings.get('hwaccel')
+        self.segment_batch_size = video_settings.get('segment_batch_size') or 1
 
         # Extract effect settings
         self.transition_duration = effect_settings['transition_duration']
@@ -66,6 +74,12 @@ class SlideshowGenerator:
         # Initialize segment renderer
         self.segment_renderer = SegmentRenderer(video_settings, logger)
 
+        # Long-lived worker threads shared by dimension probes and segment renders
+        self.worker_pool = ThreadPoolExecutor(
+            max_workers=self.segment_renderer.parallel_segments,
+            thread_name_prefix='slideshow-worker'
+        )
+
         # Initialize particle overlay generator
         particle_settings = project_config.get_particle_settings()
         self.particle_generator = ParticleOverlayGenerator(
@@ -108,7 +122,7 @@ class SlideshowGenerator:
             if invalid_images:
                 self.logger.warning(f"Skipping {len(invalid_images)} corrupted images:")
                 for invalid in invalid_images:
-                    self.logger.warning(f"  - {Path(invalid).name}")
+                    self.logger.warning(f"  - {os.path.basename(invalid)}")
             
             images = valid_images
             
@@ -127,54 +141,46 @@ class SlideshowGenerator:
                 timing_calc.get_image_durations(len(regular_images))
             )
             
-            # Save metadata for debugging
-            utils.save_metadata(metadata_list, output_file)
+            # Save metadata for debugging (opt-in via debug.save_metadata)
+            if self.project_config.get('debug.save_metadata', False):
+                utils.save_metadata(metadata_list, output_file)
             
             # Create temp directory for segments
             temp_dir = Path(output_file).parent / 'temp_segments'
             temp_dir.mkdir(exist_ok=True)
             self.logger.info(f"Using temp directory: {temp_dir}")
 
-            # Overlay video cache: maps cache_key -> overlay file path
+            # Overlay video cache: maps (duration, active windows) -> overlay file pool
             overlay_cache = {}
 
-            # Render all segments
-            segments = []
-            
             # Initialize sequence builder
             text_config = self.project_config.get_text_overlays()
             sequence_builder = SequenceBuilder(
                 self.resolution, self.fps, text_config, self.logger
             )
             
-            # 1. Render opening part 1
+            # Collect every segment job first; overlays and filters are built
+            # here so generator state (RNG, overlay cache) stays single-threaded
             self.logger.info("=" * 60)
             self.logger.info("RENDERING SEGMENTS")
             self.logger.info("=" * 60)
-            
+            jobs = []
+
+            # 1. Opening part 1
             opening1_file = temp_dir / 'seg_000_opening1.mp4'
-            opening1_filter, _ = sequence_builder.create_opening_part1(0, timings['opening_part1'])
-            # Fix filter to use [0:v] input and [out] output for segment rendering
-            opening1_filter = opening1_filter.replace('[0:v]', '[0:v]').replace('[opening_part1]', '[out]')
+            opening1_filter, _ = sequence_builder.create_opening_part1(
+                0, timings['opening_part1'], out_label='out')
 
             # No particles on opening 1 (brief intro segment)
-            opening1_overlay = None
-
-            if self.segment_renderer.render_segment(
+            jobs.append((
                 'Opening-1', special_photo, timings['opening_part1'],
-                opening1_filter, str(opening1_file),
-                overlay_path=opening1_overlay
-            ):
-                segments.append(str(opening1_file))
-            else:
-                self.logger.error("Failed to render opening part 1")
-                return False
+                opening1_filter, str(opening1_file), None, False
+            ))
 
-            # 2. Render opening part 2
+            # 2. Opening part 2
             opening2_file = temp_dir / 'seg_001_opening2.mp4'
-            opening2_filter, _ = sequence_builder.create_opening_part2(0, timings['opening_part2'])
-            # Fix filter to use [0:v] input and [out] output
-            opening2_filter = opening2_filter.replace('[0:v]', '[0:v]').replace('[opening_part2]', '[out]')
+            opening2_filter, _ = sequence_builder.create_opening_part2(
+                0, timings['opening_part2'], out_label='out')
 
             # Particle overlay for opening 2: particles at tail only (bridge to first image)
             opening2_overlay = None
@@ -182,24 +188,25 @@ class SlideshowGenerator:
                 opening2_overlay = self._get_transition_overlay(
                     timings['opening_part2'], 'opening', overlay_cache, temp_dir)
 
-            if self.segment_renderer.render_segment(
+            jobs.append((
                 'Opening-2', special_photo, timings['opening_part2'],
-                opening2_filter, str(opening2_file),
-                overlay_path=opening2_overlay
-            ):
-                segments.append(str(opening2_file))
-            else:
-                self.logger.error("Failed to render opening part 2")
-                return False
+                opening2_filter, str(opening2_file), opening2_overlay, False
+            ))
             
-            # 3. Render each regular image as a segment
-            filter_builder = SegmentFilterBuilder(self.resolution, self.fps, self.logger)
+            # 3. Each regular image as a segment
+            filter_builder = SegmentFilterBuilder(
+                self.resolution, self.fps, self.logger, hw=self.hwaccel
+            )
+
+            # Plain images (no overlay, not stream-copied) can share one FFmpeg run
+            batch = []
 
             for i, meta in enumerate(metadata_list, start=1):
                 seg_file = temp_dir / f'seg_{i+1:03d}_image{i}.mp4'
 
                 # Build filter for this image
                 img_filter = filter_builder.build_image_filter(meta, self.kb_generator, self.grader)
+                static_copy = filter_builder.is_static_copyable(meta, self.grader)
 
                 # Transition-only particle overlay (particles at start/end of segment)
                 img_overlay = None
@@ -207,21 +214,29 @@ class SlideshowGenerator:
                     img_overlay = self._get_transition_overlay(
                         meta.duration, 'middle', overlay_cache, temp_dir)
 
-                if self.segment_renderer.render_segment(
+                if self.segment_batch_size > 1 and not img_overlay and not static_copy:
+                    batch.append((i, meta, img_filter))
+                    if len(batch) == self.segment_batch_size:
+                        jobs.append(self._batch_job(batch, filter_builder, temp_dir))
+                        batch = []
+                    continue
+
+                if batch:
+                    jobs.append(self._batch_job(batch, filter_builder, temp_dir))
+                    batch = []
+
+                jobs.append((
                     f'Image-{i}', meta.path, meta.duration,
-                    img_filter, str(seg_file),
-                    overlay_path=img_overlay
-                ):
-                    segments.append(str(seg_file))
-                else:
-                    self.logger.error(f"Failed to render image {i}")
-                    return False
+                    img_filter, str(seg_file), img_overlay, static_copy
+                ))
+
+            if batch:
+                jobs.append(self._batch_job(batch, filter_builder, temp_dir))
             
-            # 4. Render closing segment
-            closing_file = temp_dir / f'seg_{len(segments):03d}_closing.mp4'
-            closing_filter, _ = sequence_builder.create_closing_sequence(0, timings['closing'])
-            # Fix filter to use [0:v] input and [out] output
-            closing_filter = closing_filter.replace('[0:v]', '[0:v]').replace('[closing]', '[out]')
+            # 4. Closing segment
+            closing_file = temp_dir / f'seg_{len(jobs):03d}_closing.mp4'
+            closing_filter, _ = sequence_builder.create_closing_sequence(
+                0, timings['closing'], out_label='out')
 
             # Particle overlay for closing: particles at head only (bridge from last image)
             closing_overlay = None
@@ -229,14 +244,20 @@ class SlideshowGenerator:
                 closing_overlay = self._get_transition_overlay(
                     timings['closing'], 'closing', overlay_cache, temp_dir)
 
-            if self.segment_renderer.render_segment(
+            jobs.append((
                 'Closing', special_photo, timings['closing'],
-                closing_filter, str(closing_file),
-                overlay_path=closing_overlay
-            ):
-                segments.append(str(closing_file))
-            else:
-                self.logger.error("Failed to render closing segment")
+                closing_filter, str(closing_file), closing_overlay, False
+            ))
+
+            # Audio preparation doesn't depend on the segments - run it alongside them
+            audio_future = self.worker_pool.submit(
+                self.segment_renderer.prepare_audio,
+                audio_file, output_file, self.audio_fade_in, self.audio_fade_out,
+                audio_duration
+            )
+
+            segments = self._render_segments(jobs)
+            if segments is None:
                 return False
             
             # 5. Concatenate all segments with audio
@@ -246,10 +267,19 @@ class SlideshowGenerator:
             
             success = self.segment_renderer.concatenate_segments(
                 segments, audio_file, output_file,
-                self.audio_fade_in, self.audio_fade_out
+                self.audio_fade_in, self.audio_fade_out,
+                audio_duration=audio_duration,
+                prepared_audio=audio_future.result()
             )
             
             if success:
+                # Segments are in the final video now - free the disk space right away
+                for segment in segments:
+                    try:
+                        os.unlink(segment)
+                    except OSError as e:
+                        self.logger.debug(f"Could not remove segment {segment}: {e}")
+
                 # Log summaries
                 self.kb_generator.log_summary()
                 
@@ -279,6 +309,78 @@ class SlideshowGenerator:
                 except Exception as e:
                     self.logger.warning(f"Could not clean up temp directory: {e}")
     
+    def close(self) -> None:
+        """Shut down the worker threads"""
+        self.worker_pool.shutdown(wait=True)
+
+    def _render_segments(self, jobs: List[Tuple]) -> Optional[List[str]]:
+        """
+        Render segment jobs concurrently (one FFmpeg process per segment)
+
+        Args:
+            jobs: (name, input, duration, filter, output, overlay, static_copy) tuples;
+                a list of inputs marks a batch rendered with render_batch
+
+        Returns:
+            Output files in job order, or None if any segment failed
+        """
+        workers = min(self.segment_renderer.parallel_segments, len(jobs))
+        show_progress = workers == 1
+        self.logger.info(f"Rendering {len(jobs)} segments with {workers} worker(s)")
+
+        futures = []
+        for name, input_file, duration, filter_str, output_file, overlay, static_copy in jobs:
+            if isinstance(input_file, list):
+                futures.append(self.worker_pool.submit(
+                    self.segment_renderer.render_batch,
+                    name, input_file, duration, filter_str, output_file,
+                    show_progress=show_progress
+                ))
+            else:
+                futures.append(self.worker_pool.submit(
+                    self.segment_renderer.render_segment,
+                    name, input_file, duration, filter_str, output_file,
+                    show_progress=show_progress,
+                    overlay_path=overlay,
+                    static_copy=static_copy
+                ))
+
+        for job, future in zip(jobs, futures):
+            if not future.result():
+                self.logger.error(f"Failed to render segment {job[0]}")
+                for pending in futures:
+                    pending.cancel()
+                # Let renders that already started finish before temp cleanup
+                for pending in futures:
+                    if not pending.cancelled():
+                        pending.exception()
+                return None
+
+        return [job[4] for job in jobs]
+
+    def _batch_job(self, batch: List[Tuple], filter_builder: SegmentFilterBuilder,
+                   temp_dir: Path) -> Tuple:
+        """
+        Build a render job for consecutive images rendered in one FFmpeg run
+
+        Args:
+            batch: (image number, metadata, filter) tuples in playback order
+            filter_builder: Segment filter builder
+            temp_dir: Temp directory for segment files
+
+        Returns:
+            Job tuple for _render_segments
+        """
+        first, last = batch[0][0], batch[-1][0]
+        seg_file = temp_dir / f'seg_{first+1:03d}_images{first}-{last}.mp4'
+        return (
+            f'Images-{first}-{last}',
+            [meta.path for _, meta, _ in batch],
+            sum(meta.duration for _, meta, _ in batch),
+            filter_builder.build_batch_filter([f for _, _, f in batch]),
+            str(seg_file), None, False
+        )
+
     def _get_transition_overlay(self, duration: float, segment_position: str,
                                 overlay_cache: dict, temp_dir: Path):
         """
@@ -287,7 +389,7 @@ class SlideshowGenerator:
         Args:
             duration: Full segment duration in seconds
             segment_position: 'middle' (both ends), 'opening' (tail only), 'closing' (head only)
-            overlay_cache: Cache dict mapping cache_key -> overlay file path
+            overlay_cache: Cache dict mapping (duration, active windows) -> overlay file pool
             temp_dir: Temp directory for overlay files
 
         Returns:
@@ -311,19 +413,26 @@ class SlideshowGenerator:
             else:
                 active_windows = [(0, td), (duration - td, duration)]
 
+        # Check cache before randomizing, so a full pool skips the RNG and the render
+        is_random = self.particle_generator.is_random_mode
+        pool = overlay_cache.setdefault((duration, tuple(active_windows)), [])
+        if len(pool) >= (OVERLAY_POOL_SIZE if is_random else 1):
+            overlay_file = pool.pop(0)
+            pool.append(overlay_file)
+            return overlay_file
+
         # Randomize type per transition if in random mode
-        if self.particle_generator.is_random_mode:
+        if is_random:
             self.particle_generator.randomize_type()
 
-        # Check cache
         cache_key = self.particle_generator.get_cache_key(duration, active_windows)
-        if cache_key in overlay_cache:
-            return overlay_cache[cache_key]
+        overlay_file = str(temp_dir / f'overlay_{cache_key}.mov')
+        if overlay_file in pool:
+            return overlay_file
 
         # Generate overlay
-        overlay_file = str(temp_dir / f'overlay_{cache_key}.mov')
         if self.particle_generator.generate_overlay_video(duration, overlay_file, active_windows):
-            overlay_cache[cache_key] = overlay_file
+            pool.append(overlay_file)
             return overlay_file
 
         return None
@@ -344,26 +453,25 @@ class SlideshowGenerator:
         if not special_photo:
             self.logger.warning(
                 f"Special photo '{special_filename}' not found! "
-                f"Using first image as fallback: {Path(images[0]).name}"
+                f"Using first image as fallback: {os.path.basename(images[0])}"
             )
             return images[0]
 
-        self.logger.info(f"Special photo: {Path(special_photo).name}")
+        self.logger.info(f"Special photo: {os.path.basename(special_photo)}")
         return special_photo
     
     def _filter_regular_images(self, images: List[str], special_photo: str) -> List[str]:
         """Remove special photo from regular images list"""
-        special_photo_abs = str(Path(special_photo).resolve()).lower()
+        special_name = os.path.basename(special_photo).lower()
         regular_images = []
         removed_count = 0
         
         for img in images:
-            img_abs = str(Path(img).resolve()).lower()
-            if img_abs == special_photo_abs:
+            # Only stat/resolve paths whose file name matches the special photo
+            name = os.path.basename(img)
+            if name.lower() == special_name and self._is_same_file(img, special_photo):
                 removed_count += 1
-                self.logger.debug(
-                    f"Removing special photo from regular images: {Path(img).name}"
-                )
+                self.logger.debug(f"Removing special photo from regular images: {name}")
             else:
                 regular_images.append(img)
         
@@ -373,18 +481,32 @@ class SlideshowGenerator:
         
         return regular_images
     
-    def _build_metadata(self, images: List[str], durations: List[float]) -> List[utils.ImageMetadata]:
+    @staticmethod
+    def _is_same_file(path1: str, path2: str) -> bool:
+        """Check whether two paths point to the same file"""
+        try:
+            return os.path.samefile(path1, path2)
+        except OSError:
+            return str(Path(path1).resolve()).lower() == str(Path(path2).resolve()).lower()
+    
+    def _build_metadata(self, images: List[str], durations: Sequence[float]) -> List[utils.ImageMetadata]:
         """Build metadata for all regular images"""
         self.logger.info("Analyzing images...")
         metadata_list = []
+
+        # Dimension probes are one ffprobe process each - run them concurrently
+        dimensions = list(self.worker_pool.map(
+            lambda path: utils.get_image_dimensions(path, self.logger), images
+        ))
         
-        for i, img_path in enumerate(images):
-            width, height = utils.get_image_dimensions(img_path, self.logger)
-            is_portrait = height > width
+        # Generate all Ken Burns effects in one batch (main thread: shared RNG state)
+        portrait_flags = [height > width for width, height in dimensions]
+        kb_configs = self.kb_generator.generate_batch(portrait_flags)
+
+        for i, (img_path, (width, height)) in enumerate(zip(images, dimensions)):
+            is_portrait = portrait_flags[i]
             duration = durations[i]
-            
-            # Generate Ken Burns effect
-            kb_config = self.kb_generator.generate_effect(is_portrait)
+            kb_config = kb_configs[i]
             
             metadata = utils.ImageMetadata(
                 path=img_path,
@@ -3,9 +3,11 @@ Integration test for YAML download and video generation via backend API
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import os
 import sys
+import time
 from pathlib import Path
 
 # Fix Unicode encoding for Windows console
@@ -13,6 +15,12 @@ if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
 
 API_BASE_URL = 'http://localhost:5000'
+STATUS_POLL_INTERVAL = 2  # Seconds between /api/generate/status checks
+GENERATION_WAIT = 3600  # Give up on a queued render after an hour (server timeout)
+
+# One keep-alive session for all API calls (no new TCP connection per request)
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
 
 # Sample YAML configuration for testing
 TEST_YAML = """project:
@@ -54,7 +62,7 @@ def test_backend_health():
     """Test backend health endpoint"""
     print("\n=== Testing Backend Health ===")
     try:
-        response = requests.get(f'{API_BASE_URL}/api/health', timeout=5)
+        response = SESSION.get(f'{API_BASE_URL}/api/health', timeout=5)
         data = response.json()
 
         print(f"Status Code: {response.status_code}")
@@ -88,12 +96,12 @@ def test_video_generation():
         print(f"Config file: {payload['filename']}")
         print(f"Output directory: {payload['output_dir']}")
 
-        # Make the request
-        response = requests.post(
+        # Queue the render (202 + job_id; 200 when served from the render cache)
+        response = SESSION.post(
             f'{API_BASE_URL}/api/generate',
             headers={'Content-Type': 'application/json'},
             json=payload,
-            timeout=600  # 10 minute timeout for video generation
+            timeout=30
         )
 
         print(f"\nResponse Status Code: {response.status_code}")
@@ -102,18 +110,42 @@ def test_video_generation():
             data = response.json()
             print(f"Response Data: {json.dumps(data, indent=2)}")
 
-            if data.get('success'):
-                print("\n✓ Video generation request successful!")
-                print(f"  Output file: {data.get('output_file', 'N/A')}")
+            config_path = data.get('config_path')
+
+            # Wait for the background render to finish
+            job_id = data.get('job_id')
+            if data.get('success') and job_id:
+                print(f"\nRender queued as job {job_id}, waiting for it to finish...")
+                deadline = time.monotonic() + GENERATION_WAIT
+                while True:
+                    if time.monotonic() > deadline:
+                        print("✗ Timed out waiting for the render to finish")
+                        return False
+                    time.sleep(STATUS_POLL_INTERVAL)
+                    status_response = SESSION.get(
+                        f'{API_BASE_URL}/api/generate/status/{job_id}', timeout=10
+                    )
+                    data = status_response.json()
+                    if data.get('status') not in ('queued', 'running'):
+                        break
+                    if data.get('last_line'):
+                        print(f"  [{data['status']}] {data['last_line']}")
+
+            output_file = data.get('output_file')
+            if data.get('success') and output_file and os.path.exists(output_file):
+                print("\n✓ Video generation successful!")
+                print(f"  Output file: {output_file}")
                 print(f"  Log file: {data.get('log_file', 'N/A')}")
-                print(f"  Config path: {data.get('config_path', 'N/A')}")
+                print(f"  Config path: {config_path or 'N/A'}")
 
                 # Check if files were created
-                config_path = data.get('config_path')
                 if config_path and os.path.exists(config_path):
                     print(f"  ✓ Config file created: {config_path}")
 
                 return True
+            elif data.get('success'):
+                print(f"\n✗ Render reported success but the output file is missing: {output_file}")
+                return False
             else:
                 print(f"\n✗ Video generation failed")
                 print(f"  Error: {data.get('error', 'Unknown error')}")
@@ -127,7 +159,7 @@ def test_video_generation():
             return False
 
     except requests.exceptions.Timeout:
-        print("✗ Request timed out (video generation may still be running)")
+        print("✗ Request to the backend timed out")
         return False
     except Exception as e:
         print(f"✗ Video generation test failed: {e}")
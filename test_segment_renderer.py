@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for segment_renderer.py filter building and the FFmpeg process runner
+
+No FFmpeg needed: renders run small Python stand-in commands.
+"""
+
+import logging
+import re
+import sys
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+
+import color_grading
+import segment_renderer
+import utils
+
+# Fix Unicode encoding for Windows console
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+RENDER_WAIT = 30  # Seconds before a stand-in render counts as deadlocked
+
+logger = logging.getLogger('test_segment_renderer')
+
+
+def _metadata(index: int = 0, is_portrait: bool = False,
+              use_ken_burns: bool = False) -> utils.ImageMetadata:
+    width, height = (3000, 4000) if is_portrait else (4000, 3000)
+    return utils.ImageMetadata(
+        path=f'img{index}.jpg', index=index, width=width, height=height,
+        is_portrait=is_portrait, duration=5.0, use_ken_burns=use_ken_burns,
+        ken_burns_type='zoom_in' if use_ken_burns else None,
+    )
+
+
+def test_is_static_copyable():
+    """Only landscape, no Ken Burns, no film grain segments are frame-identical"""
+    builder = segment_renderer.SegmentFilterBuilder((1920, 1080), 30, logger)
+    warm = color_grading.ColorGrader('warm', logger)
+    grainy = color_grading.ColorGrader('soft', logger)
+    assert not warm.config.film_grain and grainy.config.film_grain
+
+    assert builder.is_static_copyable(_metadata(), warm) is True
+    assert builder.is_static_copyable(_metadata(is_portrait=True), warm) is False
+    assert builder.is_static_copyable(_metadata(use_ken_burns=True), warm) is False
+    assert builder.is_static_copyable(_metadata(), grainy) is False
+
+
+def test_build_batch_filter():
+    """Each chain reads its own input, labels don't collide, all end in one concat"""
+    builder = segment_renderer.SegmentFilterBuilder((1920, 1080), 30, logger)
+    grader = color_grading.ColorGrader('warm', logger)
+    # The portrait chain has internal labels ([blur], [img], [bg], [fg])
+    filters = [
+        builder.build_image_filter(_metadata(0), None, grader),
+        builder.build_image_filter(_metadata(1, is_portrait=True), None, grader),
+        builder.build_image_filter(_metadata(2), None, grader),
+    ]
+    batch = builder.build_batch_filter(filters)
+    chains = batch.split(';')
+
+    assert chains[0].startswith('[0:v]') and chains[0].endswith('[out0]')
+    assert chains[-1] == '[out0][out1][out2]concat=n=3:v=1:a=0[out]', chains[-1]
+    assert '[2:v]' in batch and '[0:v]' not in batch.split('[out0]', 1)[1]
+
+    # Every internal label is produced once and consumed once
+    labels = re.findall(r'\[([^\]:]+)\]', batch)
+    for label in set(labels) - {'out'}:
+        assert labels.count(label) == 2, (label, batch)
+    assert labels.count('out') == 1
+    assert any(label.endswith('1') and label.startswith('blur') for label in labels)
+
+    # A batch of one is the single filter plus a one-input concat
+    single = builder.build_batch_filter(filters[:1])
+    assert single == filters[0].replace('[out]', '[out0]') + ';[out0]concat=n=1:v=1:a=0[out]'
+
+
+def _run(cmd, frame_data, output_file):
+    """Call _run_render on a helper thread; None means it never returned"""
+    renderer = segment_renderer.SegmentRenderer(
+        {'resolution': [64, 64], 'fps': 30, 'crf': 23, 'preset': 'fast'}, logger
+    )
+    result = []
+    worker = threading.Thread(target=lambda: result.append(renderer._run_render(
+        'test segment', cmd, 1.0, output_file, False, frame_data
+    )), daemon=True)
+    worker.start()
+    worker.join(RENDER_WAIT)
+    return result[0] if result else None
+
+
+def test_run_render_output_before_stdin():
+    """A process that prints a lot before reading its frame doesn't deadlock"""
+    root = Path(tempfile.mkdtemp())
+    try:
+        output_file = root / 'segment.mp4'
+        # Several pipe buffers of output first, then the frame, then progress
+        script = (
+            "import sys\n"
+            "sys.stdout.write('log line\\n' * 500000)\n"
+            "sys.stdout.flush()\n"
+            "data = sys.stdin.buffer.read()\n"
+            f"open({str(output_file)!r}, 'wb').write(data)\n"
+            "print('frame=   30 fps=30 q=-1.0 size=1kB time=00:00:01.00')\n"
+        )
+        frame = b'\x80' * (4 * 1024 * 1024)
+        assert _run([sys.executable, '-c', script], frame, str(output_file)) is True
+        assert output_file.stat().st_size == len(frame)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def test_run_render_early_exit():
+    """A process that exits without reading its frame fails cleanly"""
+    root = Path(tempfile.mkdtemp())
+    try:
+        script = "import sys; print('Invalid argument'); sys.exit(1)"
+        frame = b'\x80' * (4 * 1024 * 1024)
+        result = _run([sys.executable, '-c', script], frame, str(root / 'segment.mp4'))
+        assert result is False, result
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main():
+    """Run all segment renderer tests"""
+    print("=" * 60)
+    print("SEGMENT RENDERER TESTS - segment_renderer.py")
+    print("=" * 60)
+
+    tests = [value for name, value in globals().items() if name.startswith('test_')]
+    results = {}
+    for test in tests:
+        try:
+            test()
+            results[test.__name__] = True
+        except Exception as e:
+            print(f"\n✗ {test.__name__}: {type(e).__name__}: {e}")
+            results[test.__name__] = False
+
+    print("\n" + "=" * 60)
+    print("TEST SUMMARY")
+    print("=" * 60)
+    for test_name, passed in results.items():
+        status = "✓ PASS" if passed else "✗ FAIL"
+        print(f"{test_name.replace('_', ' ').title():.<50} {status}")
+
+    all_passed = all(results.values())
+    print("\n" + ("ALL TESTS PASSED ✓" if all_passed else "SOME TESTS FAILED ✗"))
+    return all_passed
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the web GUI backend (web_gui/server.py) using Flask's test client
+
+No running server or FFmpeg needed: renders use a stand-in script that
+just writes the configured output file.
+"""
+
+import io
+import json
+import sys
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / 'web_gui'))
+import server
+
+# Fix Unicode encoding for Windows console
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+# Stand-in for create_slideshow_enhanced.py: writes "video <project name>"
+FAKE_RENDER_SCRIPT = """import sys, yaml
+cfg = yaml.safe_load(open(sys.argv[2], encoding='utf-8'))
+out = cfg['paths']['output_file']
+with open(out, 'w', encoding='utf-8') as f:
+    f.write('video ' + cfg['project']['name'])
+print(f"Output file: {out}")
+"""
+
+JOB_WAIT = 30  # Seconds before a stand-in render counts as hung
+
+
+def _make_project(root: Path):
+    """Create image/audio/output folders and the stand-in render script"""
+    for name in ('images', 'audio', 'output'):
+        (root / name).mkdir()
+    (root / 'images' / 'a.jpg').write_bytes(b'jpeg')
+    script = root / 'fake_render.py'
+    script.write_text(FAKE_RENDER_SCRIPT, encoding='utf-8')
+    return script
+
+
+def _project_yaml(root: Path, name: str) -> str:
+    return (
+        f"project:\n  name: {name}\n"
+        f"paths:\n"
+        f"  images_dir: {(root / 'images').as_posix()}\n"
+        f"  audio_dir: {(root / 'audio').as_posix()}\n"
+        f"  output_file: {(root / 'output' / 'video.mp4').as_posix()}\n"
+    )
+
+
+def _generate(client, root: Path, name: str) -> dict:
+    """POST /api/generate and wait for the job; returns the final payload"""
+    response = client.post('/api/generate', json={
+        'yaml_content': _project_yaml(root, name),
+        'output_dir': str(root / 'output'),
+    })
+    data = response.get_json()
+    if response.status_code != 202:
+        return data
+
+    status_url = data['status_url']
+    deadline = time.monotonic() + JOB_WAIT
+    while time.monotonic() < deadline:
+        data = client.get(status_url).get_json()
+        if data.get('status') == 'finished':
+            return data
+        time.sleep(0.1)
+    raise AssertionError(f"Render job did not finish within {JOB_WAIT}s")
+
+
+def _with_fake_renderer(test):
+    """Run a test against a temp project with the stand-in render script"""
+    def wrapper():
+        root = Path(tempfile.mkdtemp())
+        original_script = server._SCRIPT_PATH_STR
+        try:
+            server._SCRIPT_PATH_STR = str(_make_project(root))
+            test(server.app.test_client(), root)
+        finally:
+            server._SCRIPT_PATH_STR = original_script
+            shutil.rmtree(root, ignore_errors=True)
+    wrapper.__name__ = test.__name__
+    wrapper.__doc__ = test.__doc__
+    return wrapper
+
+
+@_with_fake_renderer
+def test_render_cache_hit_and_miss(client, root):
+    """Same YAML is served from the cache; an edited YAML renders again"""
+    output_file = root / 'output' / 'video.mp4'
+
+    first = _generate(client, root, 'A')
+    assert first['success'] and not first.get('cached'), first
+    assert output_file.read_text(encoding='utf-8') == 'video A'
+
+    second = _generate(client, root, 'A')
+    assert second.get('cached') is True, second
+    assert output_file.read_text(encoding='utf-8') == 'video A'
+
+    edited = _generate(client, root, 'B')
+    assert edited['success'] and not edited.get('cached'), edited
+    assert output_file.read_text(encoding='utf-8') == 'video B'
+
+    # The earlier entry is untouched by the new render of the same output file
+    again = _generate(client, root, 'A')
+    assert again.get('cached') is True, again
+    assert output_file.read_text(encoding='utf-8') == 'video A'
+
+
+@_with_fake_renderer
+def test_render_cache_survives_output_rewrite(client, root):
+    """Rewriting the output in place (e.g. a CLI run) never corrupts a cache hit"""
+    output_file = root / 'output' / 'video.mp4'
+
+    _generate(client, root, 'A')
+    assert _generate(client, root, 'A').get('cached') is True
+
+    # The hit linked the cache entry to the output; overwrite that inode in place
+    with open(output_file, 'r+', encoding='utf-8') as f:
+        f.write('CLOBBERED')
+
+    result = _generate(client, root, 'A')
+    assert result['success'] and not result.get('cached'), result
+    assert output_file.read_text(encoding='utf-8') == 'video A'
+
+
+@_with_fake_renderer
+def test_render_cache_eviction(client, root):
+    """Only the RENDER_CACHE_SIZE most recently used renders are kept"""
+    cache_dir = root / 'output' / server.RENDER_CACHE_DIR
+    names = [f'P{i}' for i in range(server.RENDER_CACHE_SIZE + 2)]
+
+    for name in names:
+        _generate(client, root, name)
+        time.sleep(0.02)  # Distinct stamp mtimes for LRU order
+
+    videos = [p for p in cache_dir.iterdir() if p.suffix == '.mp4']
+    stamps = [p for p in cache_dir.iterdir() if p.suffix == '.json']
+    assert len(videos) == server.RENDER_CACHE_SIZE, videos
+    assert len(stamps) == server.RENDER_CACHE_SIZE, stamps
+
+    # Newest render is still a hit, the oldest was evicted and renders again
+    assert _generate(client, root, names[-1]).get('cached') is True
+    assert not _generate(client, root, names[0]).get('cached')
+
+
+def test_yaml_size_limits():
+    """YAML over MAX_YAML_BYTES (as UTF-8) and oversize bodies get a 413"""
+    client = server.app.test_client()
+
+    # Hebrew is 2 bytes per character in UTF-8: under the limit in
+    # characters, over it in bytes
+    hebrew = 'a: ' + 'ש' * (server.MAX_YAML_BYTES // 2 + 1)
+    for endpoint in ('/api/validate', '/api/generate'):
+        response = client.post(endpoint, json={'yaml_content': hebrew})
+        assert response.status_code == 413, (endpoint, response.status_code)
+
+    body = json.dumps({'yaml_content': 'a: ' + 'x' * server.MAX_REQUEST_BYTES}).encode('utf-8')
+    for endpoint in ('/api/validate', '/api/generate'):
+        # Declared Content-Length over the limit
+        response = client.post(endpoint, data=body, content_type='application/json')
+        assert response.status_code == 413, (endpoint, 'declared', response.status_code)
+
+        # Chunked body without Content-Length, cut off by Werkzeug at the limit
+        response = client.post(
+            endpoint,
+            input_stream=io.BytesIO(body),
+            headers={'Content-Type': 'application/json', 'Transfer-Encoding': 'chunked'},
+            environ_base={'wsgi.input_terminated': True},
+        )
+        assert response.status_code == 413, (endpoint, 'chunked', response.status_code)
+
+    # A small body still goes through (no paths section, so just invalid)
+    response = client.post('/api/validate', json={'yaml_content': 'a: 1'})
+    assert response.status_code == 200, response.status_code
+
+
+def test_browse_folder_pagination():
+    """Folders come first, names sort case-insensitively, pages don't overlap"""
+    root = Path(tempfile.mkdtemp())
+    try:
+        for name in ('beta', 'Alpha', 'alpha', 'Zeta', 'gamma', '.hidden', '$Recycle'):
+            (root / name).mkdir()
+        for name in ('b.JPG', 'A.png', 'notes.txt'):
+            (root / name).write_bytes(b'x')
+
+        client = server.app.test_client()
+        data = client.post('/api/browse/folder', json={
+            'path': str(root), 'include_images': True
+        }).get_json()
+        assert [f['name'] for f in data['folders']] == ['Alpha', 'alpha', 'beta', 'gamma', 'Zeta']
+        assert [f['name'] for f in data['files']] == ['A.png', 'b.JPG']
+        assert data['total'] == 7 and data['has_more'] is False
+
+        pages = []
+        offset = 0
+        while True:
+            page = client.post('/api/browse/folder', json={
+                'path': str(root), 'offset': offset, 'limit': 2
+            }).get_json()
+            assert page['offset'] == offset
+            pages.append([f['name'] for f in page['folders']])
+            offset += len(page['folders'])
+            if not page['has_more']:
+                break
+        assert pages == [['Alpha', 'alpha'], ['beta', 'gamma'], ['Zeta']], pages
+
+        response = client.post('/api/browse/folder', json={'path': str(root), 'limit': 'many'})
+        assert response.status_code == 400
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main():
+    """Run all server tests"""
+    print("=" * 60)
+    print("SERVER TESTS - web_gui/server.py")
+    print("=" * 60)
+
+    tests = [value for name, value in globals().items() if name.startswith('test_')]
+    results = {}
+    for test in tests:
+        try:
+            test()
+            results[test.__name__] = True
+        except Exception as e:
+            print(f"\n✗ {test.__name__}: {type(e).__name__}: {e}")
+            results[test.__name__] = False
+
+    print("\n" + "=" * 60)
+    print("TEST SUMMARY")
+    print("=" * 60)
+    for test_name, passed in results.items():
+        status = "✓ PASS" if passed else "✗ FAIL"
+        print(f"{test_name.replace('_', ' ').title():.<50} {status}")
+
+    all_passed = all(results.values())
+    print("\n" + ("ALL TESTS PASSED ✓" if all_passed else "SOME TESTS FAILED ✗"))
+    return all_passed
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for helpers in utils.py that don't need FFmpeg
+"""
+
+import io
+import json
+import sys
+import shutil
+import tempfile
+from pathlib import Path
+
+import utils
+
+# Fix Unicode encoding for Windows console
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+
+def _isolated_probe_cache(test):
+    """Run a test with the probe cache pointed at a temp folder and emptied"""
+    def wrapper():
+        root = Path(tempfile.mkdtemp())
+        saved = (utils.PROBE_CACHE_FILE, utils.MAX_PROBE_CACHE_ENTRIES)
+        try:
+            utils.PROBE_CACHE_FILE = root / 'cache' / 'probes.json'
+            utils._probe_cache = None
+            utils._probe_cache_used.clear()
+            utils._probe_cache_dirty = False
+            test(root)
+        finally:
+            utils.PROBE_CACHE_FILE, utils.MAX_PROBE_CACHE_ENTRIES = saved
+            utils._probe_cache = None
+            utils._probe_cache_used.clear()
+            utils._probe_cache_dirty = False
+            shutil.rmtree(root, ignore_errors=True)
+    wrapper.__name__ = test.__name__
+    wrapper.__doc__ = test.__doc__
+    return wrapper
+
+
+def _make_files(root: Path, count: int):
+    files = []
+    for i in range(count):
+        path = root / f'file{i}.bin'
+        path.write_bytes(b'x' * (i + 1))
+        files.append(str(path))
+    return files
+
+
+@_isolated_probe_cache
+def test_probe_cache_round_trip(root):
+    """Saved results are reused by the next run without probing again"""
+    files = _make_files(root, 3)
+    for i, path in enumerate(files):
+        assert utils._cached_probe('size', path, lambda i=i: [i, i * 2]) == [i, i * 2]
+    utils.save_probe_cache()
+    assert utils.PROBE_CACHE_FILE.exists()
+    assert not list(utils.PROBE_CACHE_FILE.parent.glob('*.partial'))
+
+    # Simulate the next process: nothing in memory, everything from disk
+    utils._probe_cache = None
+    utils._probe_cache_used.clear()
+
+    def must_not_probe():
+        raise AssertionError("probe ran despite a cached result")
+
+    for i, path in enumerate(files):
+        assert utils._cached_probe('size', path, must_not_probe) == [i, i * 2]
+
+    # A changed file misses (its key holds size + mtime) and is probed again
+    Path(files[0]).write_bytes(b'changed contents')
+    assert utils._cached_probe('size', files[0], lambda: 'new') == 'new'
+
+
+@_isolated_probe_cache
+def test_probe_cache_prunes_least_recently_used(root):
+    """Saving keeps only MAX_PROBE_CACHE_ENTRIES, dropping the least recently used"""
+    utils.MAX_PROBE_CACHE_ENTRIES = 3
+    files = _make_files(root, 4)
+    for path in files:
+        utils._cached_probe('size', path, lambda: 1)
+    utils._cached_probe('size', files[0], lambda: 1)  # Hit: now most recent
+    utils.save_probe_cache()
+
+    saved_paths = [key.split('|')[1] for key in json.loads(utils.PROBE_CACHE_FILE.read_bytes())]
+    assert len(saved_paths) == 3, saved_paths
+    assert files[1] not in saved_paths
+    assert saved_paths[-1] == files[0], saved_paths
+
+
+@_isolated_probe_cache
+def test_probe_cache_merges_concurrent_saves(root):
+    """Entries saved by another process meanwhile survive this process's save"""
+    files = _make_files(root, 2)
+    utils._cached_probe('size', files[0], lambda: 'ours')
+
+    # Another render saved its own entry after this process loaded the cache
+    other_key = f"size|{root / 'elsewhere.bin'}|1|1"
+    utils.PROBE_CACHE_FILE.parent.mkdir(parents=True)
+    utils.PROBE_CACHE_FILE.write_text(json.dumps({other_key: 'theirs'}), encoding='utf-8')
+
+    utils.save_probe_cache()
+    saved = json.loads(utils.PROBE_CACHE_FILE.read_bytes())
+    assert saved[other_key] == 'theirs'
+    assert 'ours' in saved.values()
+
+
+def _encoded_image(fmt: str) -> bytes:
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new('RGB', (64, 64), (200, 40, 40)).save(buffer, fmt)
+    return buffer.getvalue()
+
+
+def test_validate_image():
+    """Valid PNG/JPEG pass, files truncated mid-stream fail"""
+    if not utils.PIL_AVAILABLE:
+        print("  Pillow not installed, skipping")
+        return
+    root = Path(tempfile.mkdtemp())
+    try:
+        for fmt, suffix in (('PNG', '.png'), ('JPEG', '.jpg')):
+            data = _encoded_image(fmt)
+            valid = root / f'valid{suffix}'
+            valid.write_bytes(data)
+            assert utils.validate_image(str(valid)) is True, fmt
+
+            truncated = root / f'truncated{suffix}'
+            truncated.write_bytes(data[:len(data) // 2])
+            assert utils.validate_image(str(truncated)) is False, fmt
+
+        # Not an image Pillow knows at all: decided by FFmpeg
+        if utils.check_ffmpeg():
+            garbage = root / 'garbage.jpg'
+            garbage.write_bytes(b'not an image')
+            assert utils.validate_image(str(garbage)) is False
+            assert utils.validate_image(str(root / 'valid.png'), deep=True) is True
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main():
+    """Run all utils tests"""
+    print("=" * 60)
+    print("UTILS TESTS - utils.py")
+    print("=" * 60)
+
+    tests = [value for name, value in globals().items() if name.startswith('test_')]
+    results = {}
+    for test in tests:
+        try:
+            test()
+            results[test.__name__] = True
+        except Exception as e:
+            print(f"\n✗ {test.__name__}: {type(e).__name__}: {e}")
+            results[test.__name__] = False
+
+    print("\n" + "=" * 60)
+    print("TEST SUMMARY")
+    print("=" * 60)
+    for test_name, passed in results.items():
+        status = "✓ PASS" if passed else "✗ FAIL"
+        print(f"{test_name.replace('_', ' ').title():.<50} {status}")
+
+    all_passed = all(results.values())
+    print("\n" + ("ALL TESTS PASSED ✓" if all_passed else "SOME TESTS FAILED ✗"))
+    return all_passed
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
@@ -5,12 +5,20 @@ Timing Calculator Module
 Handles all duration calculations for the slideshow
 """
 
+import logging
 from typing import Tuple
 
 
 class TimingCalculator:
     """Calculates and manages timing for all slideshow segments"""
 
+    __slots__ = (
+        'audio_duration', 'timing_config', 'logger',
+        'OPENING_PART1_DURATION', 'OPENING_PART2_DURATION',
+        'IMAGE_DURATION', 'MIN_CLOSING_DURATION',
+        '_durations_cache',
+    )
+
     def __init__(self, audio_duration: float, timing_config: dict, logger):
         """
         Initialize timing calculator with configuration
@@ -33,12 +41,16 @@ class TimingCalculator:
                                                 timing_config.get('image_duration', 6.0))
         
         self.MIN_CLOSING_DURATION = timing_config.get('min_closing_duration', 8.0)
+
+        # Shared (immutable) image durations, rebuilt when IMAGE_DURATION changes
+        self._durations_cache = None
         
-        self.logger.debug(f"Timing config loaded: "
-                         f"opening1={self.OPENING_PART1_DURATION}s, "
-                         f"opening2={self.OPENING_PART2_DURATION}s, "
-                         f"image={self.IMAGE_DURATION}s, "
-                         f"closing_min={self.MIN_CLOSING_DURATION}s")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Timing config loaded: "
+                             f"opening1={self.OPENING_PART1_DURATION}s, "
+                             f"opening2={self.OPENING_PART2_DURATION}s, "
+                             f"image={self.IMAGE_DURATION}s, "
+                             f"closing_min={self.MIN_CLOSING_DURATION}s")
         
     def calculate_timings(self, num_regular_images: int) -> dict:
         """
@@ -50,16 +62,15 @@ class TimingCalculator:
         Returns:
             Dictionary with all timing information
         """
+        # Time left after both opening parts
+        openings_total = self.OPENING_PART1_DURATION + self.OPENING_PART2_DURATION
+        budget = self.audio_duration - openings_total
+        
         # Calculate regular images total time
         regular_images_total = num_regular_images * self.IMAGE_DURATION
         
         # Calculate closing duration (remaining time)
-        closing_duration = (
-            self.audio_duration 
-            - self.OPENING_PART1_DURATION 
-            - self.OPENING_PART2_DURATION 
-            - regular_images_total
-        )
+        closing_duration = budget - regular_images_total
         
         # Ensure minimum closing duration
         if closing_duration < self.MIN_CLOSING_DURATION:
@@ -68,16 +79,12 @@ class TimingCalculator:
                 f"is less than minimum ({self.MIN_CLOSING_DURATION}s)"
             )
             # Adjust by reducing regular image durations
-            available_time = (
-                self.audio_duration 
-                - self.OPENING_PART1_DURATION 
-                - self.OPENING_PART2_DURATION 
-                - self.MIN_CLOSING_DURATION
-            )
+            available_time = budget - self.MIN_CLOSING_DURATION
             
             if available_time > 0:
                 adjusted_image_duration = available_time / num_regular_images
                 self.IMAGE_DURATION = adjusted_image_duration
+                self._durations_cache = None
                 regular_images_total = num_regular_images * self.IMAGE_DURATION
                 closing_duration = self.MIN_CLOSING_DURATION
                 
@@ -93,12 +100,7 @@ class TimingCalculator:
                 closing_duration = self.MIN_CLOSING_DURATION
         
         # Calculate total video duration
-        total_video_duration = (
-            self.OPENING_PART1_DURATION 
-            + self.OPENING_PART2_DURATION 
-            + regular_images_total 
-            + closing_duration
-        )
+        total_video_duration = openings_total + regular_images_total + closing_duration
         
         timings = {
             'opening_part1': self.OPENING_PART1_DURATION,
@@ -116,6 +118,13 @@ class TimingCalculator:
     
     def log_timing_breakdown(self, timings: dict):
         """Log detailed timing breakdown"""
+        time_diff = abs(timings['total_video'] - self.audio_duration)
+        if not self.logger.isEnabledFor(logging.INFO):
+            # Only the mismatch warning can still be emitted
+            if time_diff >= 0.5:
+                self.logger.warning(f"  ⚠ Video differs from audio by {time_diff:.1f}s")
+            return
+        
         self.logger.info("=" * 60)
         self.logger.info("TIMING BREAKDOWN:")
         self.logger.info(f"  Opening part 1 (special photo): {timings['opening_part1']:.1f}s")
@@ -128,7 +137,6 @@ class TimingCalculator:
         self.logger.info(f"  TOTAL VIDEO: {timings['total_video']:.1f}s")
         self.logger.info(f"  Audio duration: {self.audio_duration:.1f}s")
         
-        time_diff = abs(timings['total_video'] - self.audio_duration)
         if time_diff < 0.5:
             self.logger.info(f"  ✓ Video matches audio (±{time_diff:.2f}s)")
         else:
@@ -136,19 +144,22 @@ class TimingCalculator:
         
         self.logger.info("=" * 60)
     
-    def get_image_durations(self, num_images: int) -> list:
+    def get_image_durations(self, num_images: int) -> Tuple[float, ...]:
         """
-        Get list of durations for all regular images
+        Get durations for all regular images
         
         Args:
             num_images: Number of regular images
             
         Returns:
-            List of durations (all equal to IMAGE_DURATION)
+            Tuple of durations (all equal to IMAGE_DURATION), shared between calls
         """
-        durations = [self.IMAGE_DURATION] * num_images
+        durations = self._durations_cache
+        if durations is None or len(durations) != num_images:
+            durations = self._durations_cache = (self.IMAGE_DURATION,) * num_images
         
-        self.logger.debug(f"Created {num_images} image durations, each {self.IMAGE_DURATION}s")
-        self.logger.debug(f"Sample durations: {durations[:3]}")  # Log first 3 for verification
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Created {num_images} image durations, each {self.IMAGE_DURATION}s")
+            self.logger.debug(f"Sample durations: {durations[:3]}")  # Log first 3 for verification
         
         return durations
\ No newline at end of file
@@ -6,8 +6,10 @@ Intelligent transition selection and management
 
 import random
 import logging
-from typing import List, Optional
-from dataclasses import dataclass
+from collections import Counter
+from functools import lru_cache
+from itertools import accumulate
+from typing import List, NamedTuple, Optional
 from enum import Enum
 
 
@@ -18,8 +20,11 @@ class TransitionCategory(Enum):
     ARTISTIC = "artistic"
 
 
-@dataclass
-class Transition:
+# Lookup for config category names (avoids ValueError on unknown names)
+_CATEGORY_BY_NAME = {category.value: category for category in TransitionCategory}
+
+
+class Transition(NamedTuple):
     """Transition definition with metadata"""
     name: str
     category: TransitionCategory
@@ -62,9 +67,16 @@ ARTISTIC_TRANSITIONS = [
     Transition("squeezev", TransitionCategory.ARTISTIC, "Vertical squeeze"),
 ]
 
+# Basic fades and dissolves used in simple mode
+SIMPLE_TRANSITIONS = GENTLE_TRANSITIONS[:6]
+SIMPLE_TRANSITION_NAMES = tuple(t.name for t in SIMPLE_TRANSITIONS)
+
 class TransitionSelector:
     """Intelligent transition selector with history tracking"""
 
+    # TEMPORARILY DISABLED due to FFmpeg filter parsing issues on Windows
+    ANNIVERSARY_OVERLAYS_DISABLED = True
+
     def __init__(self, weights: dict, logger: Optional[logging.Logger] = None,
                  simple_mode: bool = False, anniversary_mode: bool = False):
         """
@@ -79,9 +91,13 @@ class TransitionSelector:
         self.logger = logger or logging.getLogger(__name__)
         self.simple_mode = simple_mode
         self.anniversary_mode = anniversary_mode
+        # Callers can check this before asking for per-transition overlays
+        self.anniversary_enabled = anniversary_mode and not self.ANNIVERSARY_OVERLAYS_DISABLED
         self.history: List[str] = []
-        self.category_history: List[TransitionCategory] = []
-        self.same_category_count = 0
+        self.category_counts: Counter = Counter()
+        self.unique_names = set()
+        self.same_category_count = 0  # Run length of the last selected category
+        self._last_category: Optional[TransitionCategory] = None
 
         # Anniversary overlay tracking
         self.overlay_history: List[bool] = []  # Track which transitions have overlays
@@ -90,11 +106,11 @@ class TransitionSelector:
         # Convert string-based weights to enum-based weights
         self.category_weights = {}
         for category_name, weight in weights.items():
-            try:
-                category = TransitionCategory(category_name.lower())
-                self.category_weights[category] = weight
-            except ValueError:
+            category = _CATEGORY_BY_NAME.get(category_name.lower())
+            if category is None:
                 self.logger.warning(f"Unknown transition category: {category_name}")
+            else:
+                self.category_weights[category] = weight
 
         # Use defaults if no valid weights provided
         if not self.category_weights:
@@ -105,14 +121,38 @@ class TransitionSelector:
                 TransitionCategory.ARTISTIC: 0.10,
             }
 
+        # Private generator so selections don't contend on the module-level one
+        self._rng = random.Random()
+
+        # Weighted-choice inputs, fixed after init
+        self._categories = tuple(cat for cat in TransitionCategory if cat in self.category_weights)
+        self._weights = tuple(self.category_weights[cat] for cat in self._categories)
+        if not self._categories or sum(self._weights) == 0:
+            self._categories = ()
+        self._cum_weights = tuple(accumulate(self._weights))
+
+        # Forced-switch (categories, cumulative weights) per current category (None = no valid weights)
+        self._forced_switch = {}
+        for current_cat in TransitionCategory:
+            cats = tuple(cat for cat in self._categories if cat != current_cat)
+            weights = tuple(self.category_weights[cat] for cat in cats)
+            self._forced_switch[current_cat] = (
+                (cats, tuple(accumulate(weights))) if cats and sum(weights) > 0 else None
+            )
+
         # Build transition pool
         if simple_mode:
-            self.transitions = GENTLE_TRANSITIONS[:6]  # Basic fades and dissolves
+            self.transitions = SIMPLE_TRANSITIONS
         else:
             self.transitions = (
                 GENTLE_TRANSITIONS + DYNAMIC_TRANSITIONS + ARTISTIC_TRANSITIONS
             )
 
+        # Transitions bucketed by category (the pool is fixed after init)
+        self._by_category = {}
+        for t in self.transitions:
+            self._by_category.setdefault(t.category, []).append(t)
+
         self.logger.info(f"TransitionSelector initialized with {len(self.transitions)} transitions")
         self.logger.debug(f"Simple mode: {simple_mode}")
         if anniversary_mode:
@@ -129,30 +169,35 @@ class TransitionSelector:
         category = self._select_category()
 
         # Get transitions for this category
-        category_transitions = [t for t in self.transitions if t.category == category]
-
         # Safety check: if no transitions in selected category, use all available
-        if not category_transitions:
-            category_transitions = self.transitions
+        category_transitions = self._by_category.get(category) or self.transitions
 
         # Filter out recently used transitions
-        available = [t for t in category_transitions if t.name not in self.history[-2:]]
+        recent = set(self.history[-2:])
+        available = [t for t in category_transitions if t.name not in recent]
 
         if not available:
             available = category_transitions
 
         # Select random transition from available pool
-        transition = random.choice(available)
+        transition = self._rng.choice(available)
 
         # Update history
         self.history.append(transition.name)
-        self.category_history.append(category)
+        self.category_counts[category] += 1
+        self.unique_names.add(transition.name)
+        if category is self._last_category:
+            self.same_category_count += 1
+        else:
+            self._last_category = category
+            self.same_category_count = 1
 
         # Log selection
-        self.logger.debug(
-            f"Selected transition: {transition.name} ({transition.category.value}) - "
-            f"{transition.description}"
-        )
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                f"Selected transition: {transition.name} ({transition.category.value}) - "
+                f"{transition.description}"
+            )
 
         return transition
 
@@ -164,40 +209,34 @@ class TransitionSelector:
             Selected TransitionCategory
         """
         # Check if we need to switch categories
-        if len(self.category_history) >= 3:
-            recent_categories = self.category_history[-3:]
-            if len(set(recent_categories)) == 1:
-                # Same category 3 times, force switch
-                current_cat = recent_categories[0]
-                available_cats = [cat for cat in TransitionCategory if cat != current_cat and cat in self.category_weights]
-                weights = [self.category_weights[cat] for cat in available_cats]
-
-                # Safety check: ensure weights are valid
-                if not available_cats or not weights or sum(weights) == 0:
-                    # Fallback: use equal weights for all categories except current
-                    available_cats = [cat for cat in TransitionCategory if cat != current_cat]
-                    if available_cats:
-                        category = random.choice(available_cats)
-                    else:
-                        # Last resort: use any category
-                        category = random.choice(list(TransitionCategory))
+        if self.same_category_count >= 3:
+            # Same category 3 times, force switch
+            current_cat = self._last_category
+            forced = self._forced_switch[current_cat]
+
+            # Safety check: ensure weights are valid
+            if forced is None:
+                # Fallback: use equal weights for all categories except current
+                available_cats = [cat for cat in TransitionCategory if cat != current_cat]
+                if available_cats:
+                    category = self._rng.choice(available_cats)
                 else:
-                    category = random.choices(available_cats, weights=weights)[0]
+                    # Last resort: use any category
+                    category = self._rng.choice(list(TransitionCategory))
+            else:
+                category = self._rng.choices(forced[0], cum_weights=forced[1])[0]
 
-                self.logger.debug(f"Forcing category switch from {current_cat.value} to {category.value}")
-                return category
+            self.logger.debug(f"Forcing category switch from {current_cat.value} to {category.value}")
+            return category
 
         # Normal weighted selection
-        categories = [cat for cat in TransitionCategory if cat in self.category_weights]
-        weights = [self.category_weights[cat] for cat in categories]
-
         # Safety check: ensure weights are valid
-        if not categories or not weights or sum(weights) == 0:
+        if not self._categories:
             # Fallback: use equal weights for all categories
             self.logger.warning("Invalid category weights detected, using equal distribution")
-            category = random.choice(list(TransitionCategory))
+            category = self._rng.choice(list(TransitionCategory))
         else:
-            category = random.choices(categories, weights=weights)[0]
+            category = self._rng.choices(self._categories, cum_weights=self._cum_weights)[0]
 
         return category
 
@@ -213,17 +252,15 @@ class TransitionSelector:
 
         stats = {
             "total_transitions": total,
-            "unique_transitions": len(set(self.history)),
-            "category_distribution": {}
-        }
-
-        for category in TransitionCategory:
-            count = self.category_history.count(category)
-            percentage = (count / total) * 100
-            stats["category_distribution"][category.value] = {
-                "count": count,
-                "percentage": percentage
+            "unique_transitions": len(self.unique_names),
+            "category_distribution": {
+                category.value: {
+                    "count": self.category_counts[category],
+                    "percentage": (self.category_counts[category] / total) * 100
+                }
+                for category in TransitionCategory
             }
+        }
 
         return stats
 
@@ -238,10 +275,7 @@ class TransitionSelector:
         Returns:
             True if overlay should be added
         """
-        # TEMPORARILY DISABLED due to FFmpeg filter parsing issues on Windows
-        return False
-
-        if not self.anniversary_mode:
+        if not self.anniversary_enabled:
             return False
 
         # Don't add overlay to consecutive transitions
@@ -262,7 +296,7 @@ class TransitionSelector:
             # Have enough overlays - lower probability
             probability = 0.15
 
-        add_overlay = random.random() < probability
+        add_overlay = self._rng.random() < probability
 
         self.overlay_history.append(add_overlay)
         if add_overlay:
@@ -296,6 +330,12 @@ class TransitionSelector:
             self.logger.info(f"Anniversary overlays: {self.overlay_count} out of {total} transitions ({percentage:.1f}%)")
 
 
+@lru_cache(maxsize=128)
+def _xfade_prefix(name: str, duration: float) -> str:
+    """Constant part of an xfade filter for one transition name and duration"""
+    return f"xfade=transition={name}:duration={duration}"
+
+
 def create_transition_filter(from_label: str, to_label: str,
                             transition: Transition, duration: float,
                             offset: float) -> str:
@@ -312,17 +352,28 @@ def create_transition_filter(from_label: str, to_label: str,
     Returns:
         FFmpeg filter string
     """
-    return (
-        f"[{from_label}][{to_label}]xfade="
-        f"transition={transition.name}:"
-        f"duration={duration}:"
-        f"offset={offset}"
-    )
+    return f"[{from_label}][{to_label}]{_xfade_prefix(transition.name, duration)}:offset={offset}"
+
+
+# Gold '50' text with shadow for readability
+# NOTE: Simplified to avoid parsing issues on Windows FFmpeg
+ANNIVERSARY_OVERLAY_FILTER = (
+    "drawtext="
+    "text=50:"  # No quotes around number
+    "fontfile=C:/Windows/Fonts/arial.ttf:"  # Windows path with forward slashes
+    "fontsize=120:"
+    "fontcolor=gold:"  # Using named color instead of hex
+    "x=(w-text_w)/2:"  # Center horizontally
+    "y=(h-text_h)/2"  # Center vertically - no trailing colon
+)
 
 
 def create_anniversary_overlay_filter(duration: float = 0.9) -> str:
     """
-    Create gold '50' text overlay with fade in/out for anniversary slideshow
+    Create gold '50' text overlay for anniversary slideshow
+
+    The simplified filter has no timed fade, so the string is the same for
+    every duration and is built once at import.
 
     Args:
         duration: Transition duration in seconds (default 0.9s)
@@ -330,29 +381,9 @@ def create_anniversary_overlay_filter(duration: float = 0.9) -> str:
     Returns:
         FFmpeg drawtext filter string for '50' overlay
     """
-    # Animation timing within the transition:
-    # 0.0-0.3s: fade in (alpha 0→1)
-    # 0.3-0.6s: hold at full opacity
-    # 0.6-0.9s: fade out (alpha 1→0)
-
-    fade_in_end = duration * 0.33  # 0.3s for 0.9s transition
-    hold_end = duration * 0.67     # 0.6s for 0.9s transition
-
-    # Gold '50' text with shadow for readability
-    # NOTE: Simplified to avoid parsing issues on Windows FFmpeg
-    filter_str = (
-        f"drawtext="
-        f"text=50:"  # No quotes around number
-        f"fontfile=C:/Windows/Fonts/arial.ttf:"  # Windows path with forward slashes
-        f"fontsize=120:"
-        f"fontcolor=gold:"  # Using named color instead of hex
-        f"x=(w-text_w)/2:"  # Center horizontally
-        f"y=(h-text_h)/2"  # Center vertically - no trailing colon
-    )
-
-    return filter_str
+    return ANNIVERSARY_OVERLAY_FILTER
 
 
 def get_simple_transitions() -> List[str]:
     """Get list of simple transition names for basic mode"""
-    return [t.name for t in GENTLE_TRANSITIONS[:6]]
+    return list(SIMPLE_TRANSITION_NAMES)
@@ -6,13 +6,34 @@ Handles logging, file operations, and helper functions
 
 import os
 import sys
+import atexit
 import logging
+import logging.handlers
 import json
+import queue
+import re
+import shutil
 import subprocess
+import tempfile
+import threading
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import List, Tuple, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from PIL import Image, UnidentifiedImageError
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
 
 # Configuration
 LOG_DIR = r"C:\Users\RAZ\Desktop\Raz-Technologies\Presentation_application\Parents\Logs"
@@ -20,6 +41,19 @@ MAX_LOG_FILES = 20
 IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff'}
 AUDIO_EXTENSIONS = {'.mp3', '.m4a', '.wav', '.aac'}
 
+# Per-output-directory cache for artifacts reused across renders
+CACHE_DIR_NAME = ".slideshow_cache"
+
+# Upper bound on concurrent image validations (override with SLIDESHOW_VALIDATION_WORKERS)
+try:
+    MAX_VALIDATION_WORKERS = max(1, int(os.environ.get('SLIDESHOW_VALIDATION_WORKERS', 8)))
+except ValueError:
+    MAX_VALIDATION_WORKERS = 8
+
+# Persistent ffprobe results, keyed by kind + path + mtime + size
+PROBE_CACHE_FILE = Path.home() / '.cache' / 'slideshow_generator' / 'probes.json'
+MAX_PROBE_CACHE_ENTRIES = 20000  # Least recently used entries dropped beyond this when saving
+
 # Anniversary-specific configuration
 SPECIAL_FAMILY_PHOTO = "Screenshot_20250714_010356_WhatsApp.jpg"
 
@@ -51,36 +85,47 @@ class VideoConfig:
     audio_fade_in: float
     audio_fade_out: float
 
+# Fonts with excellent Hebrew support, in order of preference
+HEBREW_FONTS = (
+    ("Arial", r"C:\Windows\Fonts\arial.ttf"),
+    ("Calibri", r"C:\Windows\Fonts\calibri.ttf"),
+    ("Tahoma", r"C:\Windows\Fonts\tahoma.ttf"),
+    ("David", r"C:\Windows\Fonts\david.ttf"),
+    ("Miriam", r"C:\Windows\Fonts\miriam.ttf"),
+)
+
+
+@lru_cache(maxsize=1)
+def _probe_hebrew_font() -> Tuple[str, str]:
+    """Find the first installed Hebrew-capable font (probed once per process)"""
+    for font_name, font_file in HEBREW_FONTS:
+        if os.path.isfile(font_file):
+            # Convert to FFmpeg format: forward slashes, escaped colons
+            return font_name, font_file.replace("\\", "/").replace(":", "\\:")
+
+    return "", ""
+
+
 def get_hebrew_font_path(logger: Optional[logging.Logger] = None) -> str:
     """
     Get path to Hebrew-compatible font with fallback options
 
+    The font directory is only probed on the first call.
+
     Args:
         logger: Logger instance
 
     Returns:
         FFmpeg-formatted font path
     """
-    # Fonts with excellent Hebrew support, in order of preference
-    fonts_to_try = [
-        ("Arial", r"C:\Windows\Fonts\arial.ttf"),
-        ("Calibri", r"C:\Windows\Fonts\calibri.ttf"),
-        ("Tahoma", r"C:\Windows\Fonts\tahoma.ttf"),
-        ("David", r"C:\Windows\Fonts\david.ttf"),
-        ("Miriam", r"C:\Windows\Fonts\miriam.ttf"),
-    ]
-
-    for font_name, font_file in fonts_to_try:
-        if os.path.exists(font_file):
-            # Convert to FFmpeg format: forward slashes, escaped colons
-            ffmpeg_path = font_file.replace("\\", "/").replace(":", "\\:")
-            if logger:
-                logger.info(f"Using Hebrew font: {font_name}")
-            return ffmpeg_path
+    font_name, ffmpeg_path = _probe_hebrew_font()
 
     if logger:
-        logger.warning("No Hebrew fonts found, using system default")
-    return ""
+        if ffmpeg_path:
+            logger.info(f"Using Hebrew font: {font_name}")
+        else:
+            logger.warning("No Hebrew fonts found, using system default")
+    return ffmpeg_path
 
 def setup_logging(log_name: str = "slideshow", output_dir: Optional[str] = None) -> logging.Logger:
     """
@@ -89,7 +134,8 @@ def setup_logging(log_name: str = "slideshow", output_dir: Optional[str] = None)
     Args:
         log_name: Base name for the logger (typically project name)
         output_dir: Directory where output video will be saved. If provided, logs will be saved there.
-                   If None, falls back to default LOG_DIR.
+                   If None, falls back to default LOG_DIR (or ~/.cache/slideshow_generator/Logs
+                   where LOG_DIR is not an absolute path on this platform).
 
     Returns:
         Configured logger instance
@@ -99,6 +145,9 @@ def setup_logging(log_name: str = "slideshow", output_dir: Optional[str] = None)
         log_dir = Path(output_dir)
     else:
         log_dir = Path(LOG_DIR)
+        if not log_dir.is_absolute():
+            # The Windows drive path is relative elsewhere and would land in the cwd
+            log_dir = Path.home() / '.cache' / 'slideshow_generator' / 'Logs'
 
     log_dir.mkdir(parents=True, exist_ok=True)
 
@@ -114,8 +163,9 @@ def setup_logging(log_name: str = "slideshow", output_dir: Optional[str] = None)
     logger = logging.getLogger(log_name)
     logger.setLevel(logging.DEBUG)
 
-    # Remove existing handlers
+    # Remove existing handlers (and stop the file writer they fed)
     logger.handlers.clear()
+    _stop_log_listener(log_name)
 
     # File handler (DEBUG level)
     file_handler = logging.FileHandler(log_file, encoding='utf-8')
@@ -140,7 +190,14 @@ def setup_logging(log_name: str = "slideshow", output_dir: Optional[str] = None)
     console_format = logging.Formatter('[%(levelname)s] %(message)s')
     console_handler.setFormatter(console_format)
 
-    logger.addHandler(file_handler)
+    # File writes happen on a listener thread; the console handler stays
+    # synchronous so log lines keep their order relative to print() output
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    _log_listeners[log_name] = listener
+
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
     logger.addHandler(console_handler)
 
     logger.info(f"Logging initialized: {log_file}")
@@ -148,30 +205,91 @@ def setup_logging(log_name: str = "slideshow", output_dir: Optional[str] = None)
     return logger
 
 
+# Background file writers started by setup_logging, by logger name
+_log_listeners = {}
+
+
+def _stop_log_listener(log_name: str) -> None:
+    """Flush and stop the file writer for a logger, if one is running"""
+    listener = _log_listeners.pop(log_name, None)
+    if listener:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+@atexit.register
+def _stop_log_listeners() -> None:
+    """Flush queued log records to disk at exit"""
+    for log_name in list(_log_listeners):
+        _stop_log_listener(log_name)
+
+
 def _rotate_logs(log_dir: Path) -> None:
     """Delete oldest log files if exceeding MAX_LOG_FILES"""
-    log_files = sorted(log_dir.glob("*.log"), key=lambda f: f.stat().st_mtime)
+    with os.scandir(log_dir) as entries:
+        log_files = [entry for entry in entries
+                     if entry.name.endswith('.log') and entry.is_file()]
 
-    if len(log_files) > MAX_LOG_FILES:
-        files_to_delete = log_files[:len(log_files) - MAX_LOG_FILES]
-        for log_file in files_to_delete:
-            log_file.unlink()
+    # Only stat and sort when something actually has to go
+    if len(log_files) <= MAX_LOG_FILES:
+        return
 
+    log_files.sort(key=lambda entry: entry.stat().st_mtime)
+    for entry in log_files[:len(log_files) - MAX_LOG_FILES]:
+        os.unlink(entry.path)
 
+
+@lru_cache(maxsize=1)
 def check_ffmpeg() -> bool:
     """
     Check if FFmpeg is installed and accessible
 
+    The result is cached for the life of the process.
+
     Returns:
         True if FFmpeg is available, False otherwise
     """
+    # PATH lookup first so a missing FFmpeg costs no process spawn
+    if shutil.which('ffmpeg') is None:
+        return False
+
     try:
         subprocess.run(['ffmpeg', '-version'],
-                      capture_output=True, check=True)
+                      capture_output=True, check=True, timeout=5)
         return True
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError):
+        return False
+
+
+@lru_cache(maxsize=1)
+def check_cuda_filters() -> bool:
+    """
+    Check if FFmpeg was built with the CUDA filters used for GPU rendering
+
+    overlay_cuda must also take x/y as expressions (FFmpeg 6.1+), since the
+    portrait path centers with x=(W-w)/2:y=(H-h)/2; older builds only take
+    integers there. The result is cached for the life of the process.
+
+    Returns:
+        True if scale_cuda, bilateral_cuda and an expression-capable
+        overlay_cuda are all available
+    """
+    try:
+        result = subprocess.run(['ffmpeg', '-hide_banner', '-filters'],
+                                capture_output=True, text=True, check=True)
+        if not all(name in result.stdout
+                   for name in ('scale_cuda', 'overlay_cuda', 'bilateral_cuda')):
+            return False
+
+        overlay_help = subprocess.run(['ffmpeg', '-hide_banner', '-h', 'filter=overlay_cuda'],
+                                      capture_output=True, text=True, check=True)
     except (subprocess.CalledProcessError, FileNotFoundError):
         return False
 
+    # Option listing reads e.g. "  x   <string>  ..FV....... set the x expression"
+    return re.search(r'^\s+x\s+<string>', overlay_help.stdout, re.MULTILINE) is not None
+
 
 def check_disk_space(output_path: str, required_mb: int = 100) -> bool:
     """
@@ -185,18 +303,9 @@ def check_disk_space(output_path: str, required_mb: int = 100) -> bool:
         True if sufficient space available
     """
     try:
-        output_dir = Path(output_path).parent
-        stat = os.statvfs(output_dir) if hasattr(os, 'statvfs') else None
-
-        if stat:
-            available_mb = (stat.f_bavail * stat.f_frsize) / (1024 * 1024)
-            return available_mb > required_mb
-
-        # Windows fallback
-        import shutil
-        total, used, free = shutil.disk_usage(output_dir)
-        available_mb = free / (1024 * 1024)
-        return available_mb > required_mb
+        # Cross-platform (statvfs on POSIX, GetDiskFreeSpaceExW on Windows)
+        free = shutil.disk_usage(os.path.dirname(os.path.abspath(output_path))).free
+        return free > required_mb * 1024 * 1024
 
     except Exception:
         return True  # Assume sufficient space if check fails
@@ -213,44 +322,161 @@ def find_files(directory: str, extensions: set) -> List[str]:
     Returns:
         Sorted list of file paths
     """
-    dir_path = Path(directory)
-    if not dir_path.exists():
-        raise FileNotFoundError(f"Directory not found: {directory}")
-
-    files = [str(f) for f in dir_path.iterdir()
-             if f.is_file() and f.suffix.lower() in extensions]
+    # scandir entries carry the file type, so no extra stat per file; a
+    # missing directory surfaces from scandir itself instead of a pre-check
+    try:
+        with os.scandir(directory) as entries:
+            files = [entry.path for entry in entries
+                     if os.path.splitext(entry.name)[1].lower() in extensions
+                     and entry.is_file()]
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Directory not found: {directory}") from None
 
     return sorted(files)
 
 
-def get_image_dimensions(image_path: str, logger: Optional[logging.Logger] = None) -> Tuple[int, int]:
+_probe_cache = None
+_probe_cache_dirty = False
+_probe_cache_used = {}  # Keys hit or added by this run, least recently used first
+_probe_cache_lock = threading.Lock()
+
+
+def _cached_probe(kind: str, path: str, probe):
     """
-    Get image dimensions using ffprobe
+    Return a cached ffprobe result, running probe() on a miss
+
+    Entries are keyed on the file's size and mtime, so a changed file is
+    probed again. New entries are written to PROBE_CACHE_FILE at exit.
+    Hits and new entries are tracked so saving can drop the least recently used.
 
     Args:
-        image_path: Path to image file
-        logger: Optional logger instance
+        kind: Probe kind ('dimensions', 'duration')
+        path: File being probed
+        probe: Zero-argument callable returning a JSON-serializable result
 
     Returns:
-        Tuple of (width, height)
+        Probe result
+    """
+    global _probe_cache, _probe_cache_dirty
+
+    stat = os.stat(path)
+    key = f"{kind}|{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}"
+
+    with _probe_cache_lock:
+        if _probe_cache is None:
+            _probe_cache = _read_probe_cache_file()
+        if key in _probe_cache:
+            _probe_cache_used.pop(key, None)
+            _probe_cache_used[key] = None
+            return _probe_cache[key]
+
+    value = probe()
+
+    with _probe_cache_lock:
+        _probe_cache[key] = value
+        _probe_cache_used.pop(key, None)
+        _probe_cache_used[key] = None
+        _probe_cache_dirty = True
+    return value
+
+
+def _read_probe_cache_file() -> dict:
+    """Load PROBE_CACHE_FILE, or an empty dict if it is missing or unreadable"""
+    try:
+        raw = PROBE_CACHE_FILE.read_bytes()
+        return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+    except (OSError, ValueError):
+        return {}
+
+
+@atexit.register
+def save_probe_cache() -> None:
+    """
+    Write new probe results to PROBE_CACHE_FILE
+
+    Entries saved meanwhile by another process (e.g. a parallel render) are
+    re-read and merged first, then only the MAX_PROBE_CACHE_ENTRIES most
+    recently used are kept. Stale entries need no check: their key holds the
+    old mtime/size, so they simply stop matching and age out.
     """
+    global _probe_cache, _probe_cache_dirty
+
+    with _probe_cache_lock:
+        if not _probe_cache_dirty:
+            return
+        merged = _read_probe_cache_file()
+        for key, value in _probe_cache.items():
+            merged.setdefault(key, value)
+        # Entries this run used count as most recent
+        for key in _probe_cache_used:
+            merged[key] = merged.pop(key)
+        keys = list(merged)[-MAX_PROBE_CACHE_ENTRIES:]
+        _probe_cache = {key: merged[key] for key in keys}
+
+        partial_path = None
+        try:
+            PROBE_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            # Unique temp name so concurrent savers never share a partial file
+            with tempfile.NamedTemporaryFile(dir=PROBE_CACHE_FILE.parent, suffix='.partial',
+                                             delete=False) as partial_file:
+                partial_path = partial_file.name
+                if ORJSON_AVAILABLE:
+                    partial_file.write(orjson.dumps(_probe_cache))
+                else:
+                    partial_file.write(json.dumps(_probe_cache).encode('utf-8'))
+            os.replace(partial_path, PROBE_CACHE_FILE)
+            _probe_cache_dirty = False
+        except OSError:
+            # Cache is an optimization only
+            if partial_path and os.path.exists(partial_path):
+                os.remove(partial_path)
+
+
+def _probe_image_dimensions(image_path: str) -> List[int]:
+    """Read image dimensions from the file header, falling back to ffprobe"""
+    if PIL_AVAILABLE:
+        try:
+            # Image.open only parses the header; pixel data is never decoded
+            with Image.open(image_path) as img:
+                return list(img.size)
+        except OSError:
+            pass  # Unknown format for Pillow, let ffprobe try
+
     cmd = [
         'ffprobe',
         '-v', 'error',
         '-select_streams', 'v:0',
         '-show_entries', 'stream=width,height',
-        '-of', 'json',
+        '-of', 'csv=s=x:p=0',  # Bare "WIDTHxHEIGHT"
         image_path
     ]
 
+    result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    width, height = result.stdout.strip().split('x')[:2]
+    return [int(width), int(height)]
+
+
+def get_image_dimensions(image_path: str, logger: Optional[logging.Logger] = None) -> Tuple[int, int]:
+    """
+    Get image dimensions from the image header (ffprobe if Pillow can't read it)
+
+    Results are cached on disk per (path, mtime, size), so an unchanged
+    image is only probed once across runs.
+
+    Args:
+        image_path: Path to image file
+        logger: Optional logger instance
+
+    Returns:
+        Tuple of (width, height)
+    """
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        data = json.loads(result.stdout)
-        width = data['streams'][0]['width']
-        height = data['streams'][0]['height']
+        width, height = _cached_probe(
+            'dimensions', image_path, lambda: _probe_image_dimensions(image_path)
+        )
 
         if logger:
-            logger.debug(f"Image dimensions for {Path(image_path).name}: {width}x{height}")
+            logger.debug(f"Image dimensions for {os.path.basename(image_path)}: {width}x{height}")
 
         return (width, height)
     except Exception as e:
@@ -259,10 +485,27 @@ def get_image_dimensions(image_path: str, logger: Optional[logging.Logger] = Non
         return (1920, 1080)  # Default
 
 
+def _probe_audio_duration(audio_path: str) -> float:
+    """Run ffprobe for audio duration"""
+    cmd = [
+        'ffprobe',
+        '-v', 'error',
+        '-show_entries', 'format=duration',
+        '-of', 'default=noprint_wrappers=1:nokey=1',  # Bare duration value
+        audio_path
+    ]
+
+    # Binary stdout only; float() parses the ASCII bytes directly
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True)
+    return float(result.stdout)
+
+
 def get_audio_duration(audio_path: str, logger: Optional[logging.Logger] = None) -> float:
     """
     Get audio file duration in seconds
 
+    Results are cached on disk per (path, mtime, size).
+
     Args:
         audio_path: Path to audio file
         logger: Optional logger instance
@@ -270,18 +513,10 @@ def get_audio_duration(audio_path: str, logger: Optional[logging.Logger] = None)
     Returns:
         Duration in seconds
     """
-    cmd = [
-        'ffprobe',
-        '-v', 'error',
-        '-show_entries', 'format=duration',
-        '-of', 'json',
-        audio_path
-    ]
-
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        data = json.loads(result.stdout)
-        duration = float(data['format']['duration'])
+        duration = _cached_probe(
+            'duration', audio_path, lambda: _probe_audio_duration(audio_path)
+        )
 
         if logger:
             logger.info(f"Audio duration: {duration:.2f}s ({duration/60:.2f} minutes)")
@@ -305,32 +540,54 @@ def get_file_size_mb(file_path: str) -> float:
     return os.path.getsize(file_path) / (1024 * 1024)
 
 
+def _metadata_to_dict(m: ImageMetadata) -> dict:
+    """Shallow JSON-ready dict for one ImageMetadata (no asdict deep copy)"""
+    item = dict(m.__dict__)
+
+    # Handle KenBurnsConfig object
+    kb_config = item.get('ken_burns_type')
+    if kb_config is not None:
+        # Flatten nested dataclass with enum values as strings
+        item['ken_burns_type'] = {
+            'zoom_start': kb_config.zoom_start,
+            'zoom_end': kb_config.zoom_end,
+            'pan_x': kb_config.pan_x,
+            'pan_y': kb_config.pan_y,
+            'effect_type': kb_config.effect_type.value,  # Convert enum to string
+            'easing': kb_config.easing.value,  # Convert enum to string
+            'speed_multiplier': kb_config.speed_multiplier
+        }
+    return item
+
+
 def save_metadata(metadata_list: List[ImageMetadata], output_path: str) -> None:
     """Save image metadata to JSON file for debugging"""
     json_path = Path(output_path).with_suffix('.json')
 
     # Convert to JSON-serializable format
-    data = []
-    for m in metadata_list:
-        item = asdict(m)
-        
-        # Handle KenBurnsConfig object
-        if item.get('ken_burns_type') is not None:
-            kb_config = item['ken_burns_type']
-            # Convert nested dataclass to dict with enum values as strings
-            item['ken_burns_type'] = {
-                'zoom_start': kb_config['zoom_start'],
-                'zoom_end': kb_config['zoom_end'],
-                'pan_x': kb_config['pan_x'],
-                'pan_y': kb_config['pan_y'],
-                'effect_type': kb_config['effect_type'].value,  # Convert enum to string
-                'easing': kb_config['easing'].value,  # Convert enum to string
-                'speed_multiplier': kb_config['speed_multiplier']
-            }
-        data.append(item)
-
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2)
+    data = [_metadata_to_dict(m) for m in metadata_list]
+
+    # Serialize in one go and write once (json.dump issues many small writes)
+    if ORJSON_AVAILABLE:
+        json_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        json_path.write_text(json.dumps(data, indent=2), encoding='utf-8')
+
+
+def _emit(logger: Optional[logging.Logger], message: str, level: int = logging.INFO) -> None:
+    """
+    Report a message once: through the logger (whose console handler already
+    writes to stdout) or, without a logger, with print
+
+    Args:
+        logger: Optional logger instance
+        message: Message text
+        level: Logging level
+    """
+    if logger:
+        logger.log(level, message)
+    else:
+        print(message)
 
 
 def print_header(text: str) -> None:
@@ -350,22 +607,23 @@ def find_image_by_name(images: List[str], partial_name: str,
         logger.debug(f"Searching for image: {partial_name}")
     
     # Extract just the filename if a path was provided
-    search_filename = Path(partial_name).name.lower()
+    search_filename = os.path.basename(partial_name).lower()
     
-    # Try exact match first
-    for img_path in images:
-        filename = Path(img_path).name.lower()
-        if search_filename == filename:
-            if logger:
-                logger.info(f"Found special image (exact match): {Path(img_path).name}")
-            return img_path
+    # Lowercased filenames, computed once for both passes
+    names = [(img_path, os.path.basename(img_path).lower()) for img_path in images]
+    
+    # Try exact match first (reversed so the first of any duplicates wins)
+    img_path = {filename: path for path, filename in reversed(names)}.get(search_filename)
+    if img_path:
+        if logger:
+            logger.info(f"Found special image (exact match): {os.path.basename(img_path)}")
+        return img_path
     
     # Try partial match
-    for img_path in images:
-        filename = Path(img_path).name.lower()
+    for img_path, filename in names:
         if search_filename in filename:
             if logger:
-                logger.info(f"Found special image (partial match): {Path(img_path).name}")
+                logger.info(f"Found special image (partial match): {os.path.basename(img_path)}")
             return img_path
     
     # Not found
@@ -434,7 +692,7 @@ def print_summary(images_count: int, audio_file: str, output_file: str,
 
     info = [
         f"Images processed: {images_count}",
-        f"Audio file: {Path(audio_file).name}",
+        f"Audio file: {os.path.basename(audio_file)}",
         f"Output file: {output_file}",
     ]
 
@@ -448,32 +706,54 @@ def print_summary(images_count: int, audio_file: str, output_file: str,
     info.append(f"Processing time: {format_duration(elapsed_time)}")
 
     for line in info:
-        print(f"  {line}")
-        logger.info(line)
+        _emit(logger, line)
 
     print("=" * 70)
 
     if os.path.exists(output_file):
-        logger.info("Slideshow video created successfully!")
-        print("\n[+] Slideshow video created successfully!")
-        print("[+] Ready for your celebration!")
+        _emit(logger, "Slideshow video created successfully!")
+        _emit(logger, "Ready for your celebration!")
     else:
-        logger.error("Output file not found!")
-        print("\n[!] Output file not found!")
+        _emit(logger, "Output file not found!", logging.ERROR)
 
 # Add these at the END of utils.py
 
-def validate_image(image_path: str, logger: Optional[logging.Logger] = None) -> bool:
+def validate_image(image_path: str, logger: Optional[logging.Logger] = None,
+                   deep: bool = False) -> bool:
     """
-    Validate image integrity using FFmpeg
+    Validate image integrity
+
+    By default Pillow's verify() checks the file structure in-process
+    without decoding pixels (truncated JPEG scan data is not caught); FFmpeg
+    does a full decode when deep=True, when Pillow can't read the format,
+    or when the image is too large for Pillow to open safely.
     
     Args:
         image_path: Path to image file
         logger: Optional logger instance
+        deep: Decode the whole image with FFmpeg
         
     Returns:
         True if image is valid, False if corrupted
     """
+    if PIL_AVAILABLE and not deep:
+        try:
+            with Image.open(image_path) as img:
+                img.verify()
+            return True
+        except UnidentifiedImageError:
+            pass  # Not a format Pillow knows, let FFmpeg decide
+        except Image.DecompressionBombError as e:
+            # Not corruption, just over Pillow's pixel limit
+            if logger:
+                logger.warning(f"Image too large for Pillow check, using FFmpeg: "
+                               f"{os.path.basename(image_path)} ({e})")
+        except (OSError, SyntaxError) as e:
+            if logger:
+                logger.error(f"Image validation failed: {os.path.basename(image_path)}")
+                logger.error(f"Pillow error: {e}")
+            return False
+
     cmd = [
         'ffmpeg',
         '-v', 'error',
@@ -492,7 +772,7 @@ def validate_image(image_path: str, logger: Optional[logging.Logger] = None) ->
         
         if result.returncode != 0 or result.stderr.strip():
             if logger:
-                logger.error(f"Image validation failed: {Path(image_path).name}")
+                logger.error(f"Image validation failed: {os.path.basename(image_path)}")
                 logger.error(f"FFmpeg error: {result.stderr.strip()}")
             return False
         
@@ -500,17 +780,20 @@ def validate_image(image_path: str, logger: Optional[logging.Logger] = None) ->
         
     except subprocess.TimeoutExpired:
         if logger:
-            logger.error(f"Image validation timeout: {Path(image_path).name}")
+            logger.error(f"Image validation timeout: {os.path.basename(image_path)}")
         return False
     except Exception as e:
         if logger:
-            logger.error(f"Image validation exception for {Path(image_path).name}: {e}")
+            logger.error(f"Image validation exception for {os.path.basename(image_path)}: {e}")
         return False
 
 
 def validate_all_images(images: List[str], logger: Optional[logging.Logger] = None) -> Tuple[List[str], List[str]]:
     """
     Validate all images and return valid/invalid lists
+
+    Checks run concurrently (Pillow header checks, FFmpeg decodes for
+    formats Pillow can't read); results keep the input order.
     
     Args:
         images: List of image paths
@@ -522,25 +805,19 @@ def validate_all_images(images: List[str], logger: Optional[logging.Logger] = No
     valid = []
     invalid = []
     
-    if logger:
-        logger.info(f"Validating {len(images)} images...")
-    
-    print(f"[*] Validating {len(images)} images...")
+    _emit(logger, f"Validating {len(images)} images...")
     
-    for i, img in enumerate(images, 1):
-        if validate_image(img, logger):
+    workers = min(MAX_VALIDATION_WORKERS, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(lambda img: validate_image(img, logger), images))
+
+    for img, is_valid in zip(images, results):
+        if is_valid:
             valid.append(img)
-            if i % 10 == 0:  # Progress every 10 images
-                print(f"    Validated {i}/{len(images)} images...")
         else:
             invalid.append(img)
-            if logger:
-                logger.warning(f"Skipping corrupted image: {Path(img).name}")
-            print(f"    [!] Corrupted image skipped: {Path(img).name}")
-    
-    if logger:
-        logger.info(f"Validation complete: {len(valid)} valid, {len(invalid)} invalid")
+            _emit(logger, f"Skipping corrupted image: {os.path.basename(img)}", logging.WARNING)
     
-    print(f"[*] Validation complete: {len(valid)} valid, {len(invalid)} invalid")
+    _emit(logger, f"Validation complete: {len(valid)} valid, {len(invalid)} invalid")
     
     return valid, invalid
\ No newline at end of file
@@ -5,6 +5,11 @@
 import sys
 from pathlib import Path
 from config import ProjectConfig
+from utils import find_files
+
+# Extensions counted by this check
+IMAGE_FILE_EXTENSIONS = {'.jpg', '.jpeg', '.png'}
+AUDIO_FILE_EXTENSIONS = {'.mp3', '.wav'}
 
 config_file = sys.argv[1] if len(sys.argv) > 1 else "config/projects/test_project.yaml"
 
@@ -38,7 +43,7 @@ print(f"  Images: {images_dir}")
 print(f"  Audio: {audio_dir}")
 
 if images_dir.exists():
-    image_files = list(images_dir.glob("*.jpg")) + list(images_dir.glob("*.png")) + list(images_dir.glob("*.jpeg"))
+    image_files = find_files(str(images_dir), IMAGE_FILE_EXTENSIONS)
     print(f"\n[OK] Found {len(image_files)} image(s)")
     if len(image_files) < 2:
         print("  [WARN] Warning: Need at least 2 images")
@@ -46,7 +51,7 @@ else:
     print(f"\n[FAIL] Images directory not found")
 
 if audio_dir.exists():
-    audio_files = list(audio_dir.glob("*.mp3")) + list(audio_dir.glob("*.wav"))
+    audio_files = find_files(str(audio_dir), AUDIO_FILE_EXTENSIONS)
     print(f"[OK] Found {len(audio_files)} audio file(s)")
     if len(audio_files) == 0:
         print("  [FAIL] Error: No audio files found")
@@ -0,0 +1,18 @@
+"""
+Gunicorn settings for the Slideshow Configuration Builder backend
+
+Loaded automatically when gunicorn is started from the web_gui directory.
+"""
+
+import os
+
+bind = os.environ.get('SLIDESHOW_BIND', '127.0.0.1:5000')
+
+# Render jobs and caches live in process memory, so /api/generate/status
+# must reach the worker that queued the job: one worker, many threads
+workers = 1
+worker_class = 'gthread'
+threads = int(os.environ.get('SLIDESHOW_THREADS', '8'))
+
+# /api/generate/stream holds a connection open for the whole render
+timeout = 0
@@ -4,6 +4,7 @@
  */
 
 const API_BASE_URL = 'http://localhost:5000';
+const GENERATION_POLL_INTERVAL_MS = 2000;
 
 /**
  * Generate video via backend API
@@ -34,7 +35,10 @@ function generateVideoNow() {
     })
     .then(response => response.json())
     .then(data => {
-        if (data.success) {
+        if (data.success && data.job_id) {
+            pollGenerationStatus(data.job_id);
+        } else if (data.success && data.cached) {
+            // Same config already rendered - served from the render cache
             showProgressSuccess(data.output_file, data.log_file);
         } else {
             showProgressError(data.error || 'Unknown error occurred');
@@ -47,6 +51,28 @@ function generateVideoNow() {
     });
 }
 
+/**
+ * Poll a queued generation job until it finishes
+ */
+function pollGenerationStatus(jobId) {
+    fetch(`${API_BASE_URL}/api/generate/status/${jobId}`)
+    .then(response => response.json())
+    .then(data => {
+        if (data.status === 'queued' || data.status === 'running') {
+            setTimeout(() => pollGenerationStatus(jobId), GENERATION_POLL_INTERVAL_MS);
+        } else if (data.success) {
+            showProgressSuccess(data.output_file, data.log_file);
+        } else {
+            showProgressError(data.error || 'Unknown error occurred');
+        }
+    })
+    .catch(error => {
+        // Transient network error - keep polling
+        console.log('Status check failed, retrying:', error);
+        setTimeout(() => pollGenerationStatus(jobId), GENERATION_POLL_INTERVAL_MS);
+    });
+}
+
 /**
  * Check backend server health
  */
@@ -154,12 +154,13 @@ function renderQuickPaths() {
 /**
  * Browse folder at specified path
  * @param {string} path - Folder path to browse
+ * @param {number} offset - Index of the first entry to fetch (> 0 appends the next page)
  */
-async function browseFolderPath(path) {
+async function browseFolderPath(path, offset = 0) {
     try {
         showBrowserLoading(true);
 
-        const requestBody = { path };
+        const requestBody = { path, offset };
         if (folderBrowser.fileMode) {
             requestBody.include_images = true;
         }
@@ -177,7 +178,10 @@ async function browseFolderPath(path) {
         if (data.success) {
             folderBrowser.currentPath = data.current_path;
             renderBreadcrumb(data.current_path, data.parent_path);
-            renderFolders(data.folders, data.files || []);
+            renderFolders(data.folders, data.files || [], offset > 0);
+            if (data.has_more) {
+                renderLoadMore(data.current_path, data.offset + data.folders.length + (data.files || []).length, data.total);
+            }
         } else {
             showBrowserError(data.error || 'Failed to browse folder');
         }
@@ -221,14 +225,20 @@ function renderBreadcrumb(currentPath, parentPath) {
  * Render folder list and optionally image files
  * @param {Array} folders - Array of folder objects {name, path}
  * @param {Array} files - Array of file objects {name, path} (image files in file mode)
+ * @param {boolean} append - Add to the current listing instead of replacing it
  */
-function renderFolders(folders, files) {
+function renderFolders(folders, files, append = false) {
     const grid = document.getElementById('folderGrid');
     if (!grid) return;
 
-    grid.innerHTML = '';
+    if (append) {
+        const loadMore = grid.querySelector('.load-more-item');
+        if (loadMore) loadMore.remove();
+    } else {
+        grid.innerHTML = '';
+    }
 
-    if (folders.length === 0 && (!files || files.length === 0)) {
+    if (!append && folders.length === 0 && (!files || files.length === 0)) {
         grid.innerHTML = '<div class="no-folders">No subfolders' +
             (folderBrowser.fileMode ? ' or image files' : '') + ' found</div>';
         return;
@@ -261,6 +271,26 @@ function renderFolders(folders, files) {
     }
 }
 
+/**
+ * Add a "load more" tile that fetches the next page of a large folder
+ * @param {string} path - Folder being listed
+ * @param {number} nextOffset - Offset of the next page
+ * @param {number} total - Total number of entries in the folder
+ */
+function renderLoadMore(path, nextOffset, total) {
+    const grid = document.getElementById('folderGrid');
+    if (!grid) return;
+
+    const moreDiv = document.createElement('div');
+    moreDiv.className = 'folder-item load-more-item';
+    moreDiv.innerHTML = `
+        <div class="folder-icon">⋯</div>
+        <div class="folder-name">Show more (${nextOffset} of ${total})</div>
+    `;
+    moreDiv.onclick = () => browseFolderPath(path, nextOffset);
+    grid.appendChild(moreDiv);
+}
+
 /**
  * Select a file and close browser (used in file mode)
  * @param {string} filePath - Full path to the selected file
@@ -3,101 +3,392 @@ Backend Server for Slideshow Configuration Builder
 Provides API endpoint for video generation
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from werkzeug.exceptions import RequestEntityTooLarge
 import subprocess
 import os
 import sys
+import hashlib
+import heapq
+import json
+import re
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import logging
+import yaml
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from flask_compress import Compress
+    COMPRESS_AVAILABLE = True
+except ImportError:
+    COMPRESS_AVAILABLE = False
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (same key order and indent rules)"""
+
+    def dumps(self, obj, **kwargs) -> str:
+        option = orjson.OPT_SORT_KEYS if self.sort_keys else 0
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+# Largest yaml_content accepted by /api/validate and /api/generate; the
+# request body limit leaves room for the JSON envelope around it
+MAX_YAML_BYTES = 1_000_000
+MAX_REQUEST_BYTES = MAX_YAML_BYTES + 64 * 1024
+
 app = Flask(__name__)
+app.config['MAX_CONTENT_LENGTH'] = MAX_REQUEST_BYTES
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
 CORS(app)  # Enable CORS for frontend requests
 
+# gzip/brotli for larger JSON answers (render stdout, big folder listings);
+# the SSE stream's text/event-stream type is not in the compressed set
+if COMPRESS_AVAILABLE:
+    app.config['COMPRESS_MIN_SIZE'] = 1024
+    app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+    Compress(app)
+
 # Get the project root directory (parent of web_gui)
 PROJECT_ROOT = Path(__file__).parent.parent
 
-@app.route('/api/generate', methods=['POST'])
-def generate_video():
+# Invariant parts of the render subprocess call, built once at import
+# (UTF-8 stdio so Hebrew output survives on Windows)
+SCRIPT_PATH = PROJECT_ROOT / 'create_slideshow_enhanced.py'
+_SCRIPT_PATH_STR = str(SCRIPT_PATH)
+_PROJECT_ROOT_STR = str(PROJECT_ROOT)
+_BASE_ENV = {**os.environ, 'PYTHONIOENCODING': 'utf-8'}
+
+# Image files listed by /api/browse/folder when include_images is set
+BROWSE_IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.bmp', '.gif', '.tiff', '.webp'})
+
+# Name prefixes of hidden and system folders left out of /api/browse/folder
+HIDDEN_PREFIXES = ('.', '$')
+
+# Page size for /api/browse/folder (default and upper bound for "limit")
+BROWSE_PAGE_SIZE = 500
+BROWSE_MAX_PAGE_SIZE = 2000
+
+# Images counted for the project-size warnings in /api/validate
+PROJECT_IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png'})
+
+# Serialized /api/browse/quick-paths answer, refreshed after QUICK_PATHS_TTL seconds
+QUICK_PATHS_TTL = 60
+_quick_paths_cache = {'body': None, 'time': 0.0}
+
+# "Output file: ..." / "Log file: ..." lines printed by the slideshow script
+_OUTPUT_PATH_RE = re.compile(r'(Output file|output_file|Log file|log_file):(.*)$', re.MULTILINE)
+
+# Background renders for /api/generate (each worker waits on a subprocess)
+RENDER_WORKERS = 2
+render_executor = ThreadPoolExecutor(max_workers=RENDER_WORKERS, thread_name_prefix='render')
+render_jobs = OrderedDict()  # job_id -> (Future of (payload, status code), stdout lines so far)
+_render_job_done_at = {}  # job_id -> time.monotonic() when the render finished
+_render_jobs_lock = threading.Lock()
+RENDER_JOB_TTL = 3600  # Seconds a finished, never-polled result is kept
+MAX_RENDER_JOBS = 64  # Tracked jobs before the oldest finished ones are dropped
+GENERATION_TIMEOUT = 3600  # 1 hour
+ERROR_TAIL_LINES = 20  # Output lines reported as the error of a failed render
+STREAM_POLL_INTERVAL = 0.5  # Seconds between checks for new output in /api/generate/stream
+
+# Finished videos kept per output folder in RENDER_CACHE_DIR, keyed by a
+# fingerprint of the YAML, its input files and the slideshow code; an
+# identical re-submission is answered from here instead of re-rendering
+RENDER_CACHE_DIR = '.render_cache'
+RENDER_CACHE_SIZE = 5  # Videos kept per cache folder (oldest use evicted first)
+
+# Parsed configs for /api/validate, keyed by YAML content hash (LRU)
+CONFIG_CACHE_SIZE = 128
+_config_cache = OrderedDict()
+_config_cache_lock = threading.Lock()
+
+
+def _mark_render_job_done(job_id: str) -> None:
+    """Record when a job finished (render worker thread) so it can expire"""
+    with _render_jobs_lock:
+        if job_id in render_jobs:
+            _render_job_done_at[job_id] = time.monotonic()
+
+
+def _forget_render_job(job_id: str) -> None:
+    """Drop a job's future and output buffer"""
+    with _render_jobs_lock:
+        render_jobs.pop(job_id, None)
+        _render_job_done_at.pop(job_id, None)
+
+
+def _prune_render_jobs() -> None:
+    """Evict finished jobs nobody collected: past RENDER_JOB_TTL, or oldest first over MAX_RENDER_JOBS"""
+    now = time.monotonic()
+    with _render_jobs_lock:
+        excess = len(render_jobs) - MAX_RENDER_JOBS
+        finished = [job_id for job_id, (future, _) in render_jobs.items() if future.done()]
+        for job_id in finished:  # Submission order, oldest first
+            if excess > 0 or now - _render_job_done_at.get(job_id, now) > RENDER_JOB_TTL:
+                render_jobs.pop(job_id)
+                _render_job_done_at.pop(job_id, None)
+                excess -= 1
+
+
+def _write_file(path: str, data: bytes) -> None:
+    """Write bytes to a file with raw os.write calls (no text or buffer layer)"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _json_body():
     """
-    Generate video from YAML configuration
+    Parse the JSON request body, enforcing MAX_CONTENT_LENGTH for chunked bodies too
 
-    Expected JSON payload:
-    {
-        "yaml_content": "...",
-        "filename": "config.yaml",
-        "output_dir": "/path/to/output"
-    }
+    Werkzeug rejects an oversize Content-Length itself, but a body sent
+    without one is cut off at the limit; reading past the cut raises
+    RequestEntityTooLarge instead of handing back truncated JSON.
     """
+    if len(request.get_data()) >= MAX_REQUEST_BYTES:
+        request.stream.read(1)
+    return request.get_json()
+
+
+def _yaml_hash(yaml_content: str) -> bytes:
+    """Cache key for submitted YAML text"""
+    return hashlib.blake2b(yaml_content.encode('utf-8'), digest_size=16).digest()
+
+
+def _cached_config(content_hash: bytes):
+    """Return the cached ProjectConfig for a content hash, or None"""
+    with _config_cache_lock:
+        config = _config_cache.get(content_hash)
+        if config is not None:
+            _config_cache.move_to_end(content_hash)
+        return config
+
+
+def _cache_config(content_hash: bytes, config) -> None:
+    """Store a parsed ProjectConfig, evicting the least recently used"""
+    with _config_cache_lock:
+        _config_cache[content_hash] = config
+        if len(_config_cache) > CONFIG_CACHE_SIZE:
+            _config_cache.popitem(last=False)
+
+def _dir_fingerprint(hasher, directory, suffix: str = '') -> None:
+    """Feed name, size and mtime of the files in a directory into a hash"""
+    if not directory:
+        return
+    stats = []
     try:
-        data = request.json
-        yaml_content = data.get('yaml_content')
-        filename = data.get('filename', 'config.yaml')
-        output_dir = data.get('output_dir', '')
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name.endswith(suffix) and entry.is_file():
+                    st = entry.stat()
+                    stats.append((entry.name, st.st_size, st.st_mtime_ns))
+    except OSError:
+        pass
+    stats.sort()
+    hasher.update(repr((str(directory), stats)).encode('utf-8'))
+
+
+def _render_fingerprint(yaml_content: str, paths: dict) -> str:
+    """
+    Key a render by everything that can change its result
 
-        if not yaml_content:
-            return jsonify({'success': False, 'error': 'No YAML content provided'}), 400
+    Args:
+        yaml_content: Submitted YAML text
+        paths: The config's paths section (images_dir, audio_dir, ...)
 
-        # Create output directory if it doesn't exist
-        if output_dir:
-            os.makedirs(output_dir, exist_ok=True)
-            config_path = os.path.join(output_dir, filename)
-        else:
-            config_path = os.path.join(PROJECT_ROOT, filename)
+    Returns:
+        Hex digest used as the render cache file name
+    """
+    hasher = hashlib.blake2b(yaml_content.encode('utf-8'), digest_size=16)
+    _dir_fingerprint(hasher, paths.get('images_dir'))
+    _dir_fingerprint(hasher, paths.get('audio_dir'))
+    _dir_fingerprint(hasher, PROJECT_ROOT, '.py')  # Slideshow script and its modules
+    _dir_fingerprint(hasher, PROJECT_ROOT / 'config', '.py')
+    return hasher.hexdigest()
 
-        # Write YAML file
-        logger.info(f"Writing config to: {config_path}")
-        with open(config_path, 'w', encoding='utf-8') as f:
-            f.write(yaml_content)
 
-        # Path to the slideshow script
-        script_path = PROJECT_ROOT / 'create_slideshow_enhanced.py'
+def _render_cache_path(output_file: str, cache_key: str) -> str:
+    """Cache entry for a render, next to the video it produces"""
+    cache_dir = os.path.join(os.path.dirname(output_file), RENDER_CACHE_DIR)
+    return os.path.join(cache_dir, cache_key + os.path.splitext(output_file)[1])
 
-        if not script_path.exists():
-            return jsonify({
-                'success': False,
-                'error': f'Slideshow script not found at {script_path}'
-            }), 404
 
-        # Run the slideshow generation script
-        logger.info(f"Starting video generation with config: {config_path}")
+def _render_cache_stamp(cache_file: str) -> str:
+    """Sidecar recording the size/mtime a cache entry had when it was stored"""
+    return cache_file + '.json'
 
-        cmd = [sys.executable, str(script_path), '--config', config_path]
-        logger.info(f"Running command: {' '.join(cmd)}")
 
-        # Set environment for UTF-8 encoding on Windows
-        env = os.environ.copy()
-        env['PYTHONIOENCODING'] = 'utf-8'
+def _store_render(output_file: str, cache_key: str) -> None:
+    """
+    Copy a finished video into the render cache and evict old entries
+
+    The entry is an independent copy (temp file + os.replace), never a link
+    to output_file, so rewriting the output later can't change it. Its
+    size/mtime go into a sidecar stamp that is checked before every reuse;
+    the stamp's own mtime orders entries for eviction.
+    """
+    cache_file = _render_cache_path(output_file, cache_key)
+    cache_dir = os.path.dirname(cache_file)
+    partial_path = None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=cache_dir, suffix='.partial', delete=False) as partial:
+            partial_path = partial.name
+            with open(output_file, 'rb') as source:
+                shutil.copyfileobj(source, partial, 1 << 20)
+        os.replace(partial_path, cache_file)
+        partial_path = None
+
+        stat = os.stat(cache_file)
+        _write_file(_render_cache_stamp(cache_file),
+                    json.dumps({'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}).encode('utf-8'))
+
+        with os.scandir(cache_dir) as it:
+            stamps = sorted((e for e in it if e.name.endswith('.json') and e.is_file()),
+                            key=lambda e: e.stat().st_mtime, reverse=True)
+        for stale in stamps[RENDER_CACHE_SIZE:]:
+            os.remove(stale.path)
+            video = stale.path[:-len('.json')]
+            if os.path.exists(video):
+                os.remove(video)
+    except OSError as e:
+        logger.warning(f"Could not cache render {output_file}: {e}")
+        if partial_path and os.path.exists(partial_path):
+            os.remove(partial_path)
+
+
+def _reuse_cached_render(output_file: str, cache_key: str) -> bool:
+    """
+    Put a cached render at output_file if a valid entry exists
+
+    Entries whose size/mtime no longer match their stamp were modified after
+    being stored and are discarded. The video is hard linked from the cache
+    to output_file (copied where links aren't supported).
+
+    Returns:
+        True if output_file now holds the cached video
+    """
+    cache_file = _render_cache_path(output_file, cache_key)
+    stamp_file = _render_cache_stamp(cache_file)
+    try:
+        with open(stamp_file, 'rb') as f:
+            stamp = json.loads(f.read())
+        stat = os.stat(cache_file)
+    except (OSError, ValueError):
+        return False
+
+    if stat.st_size != stamp.get('size') or stat.st_mtime_ns != stamp.get('mtime_ns'):
+        logger.warning(f"Cached render {cache_file} changed since it was stored, discarding it")
+        for path in (cache_file, stamp_file):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        return False
 
-        # Run subprocess and capture output
-        result = subprocess.run(
+    try:
+        if os.path.lexists(output_file):
+            os.remove(output_file)
+        try:
+            os.link(cache_file, output_file)
+        except OSError:
+            shutil.copyfile(cache_file, output_file)
+        os.utime(stamp_file)  # Mark as recently used
+    except OSError as e:
+        logger.warning(f"Could not reuse cached render {cache_file}: {e}")
+        return False
+    return True
+
+
+def _run_generation(cmd: list, config_path: str, output_dir: str, filename: str,
+                    output_lines: list, cache_key: str = None):
+    """
+    Run the slideshow script and build the API response (render worker thread)
+
+    Args:
+        cmd: Command line for the slideshow script
+        config_path: YAML config written for this job
+        output_dir: Requested output directory ('' if none)
+        filename: Config filename, used to guess the video name
+        output_lines: List that receives stdout lines as they are produced
+        cache_key: Render fingerprint; the finished video is cached under it
+
+    Returns:
+        Tuple of (response payload, HTTP status code)
+    """
+    try:
+        # Run subprocess, reading stdout line by line as it is produced
+        proc = subprocess.Popen(
             cmd,
-            cwd=str(PROJECT_ROOT),
-            capture_output=True,
-            text=True,
-            timeout=3600,  # 1 hour timeout
-            env=env,
+            cwd=_PROJECT_ROOT_STR,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,  # Tracebacks land in the same stream, in order
+            env=_BASE_ENV,
             encoding='utf-8',
-            errors='replace'
+            errors='replace',
+            bufsize=1
         )
 
-        if result.returncode == 0:
+        timed_out = threading.Event()
+
+        def _kill_on_timeout():
+            timed_out.set()
+            proc.kill()
+
+        watchdog = threading.Timer(GENERATION_TIMEOUT, _kill_on_timeout)
+        watchdog.start()
+
+        try:
+            for line in proc.stdout:
+                output_lines.append(line)
+            returncode = proc.wait()
+        finally:
+            watchdog.cancel()
+
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(cmd, GENERATION_TIMEOUT)
+
+        stdout = ''.join(output_lines)
+
+        if returncode == 0:
             logger.info("Video generation completed successfully")
 
-            # Parse output to find the generated video file
-            output_lines = result.stdout.split('\n')
+            # Find the generated video and log paths in one pass (last mention wins)
             output_file = None
             log_file = None
-
-            for line in output_lines:
-                if 'Output file:' in line or 'output_file:' in line:
-                    output_file = line.split(':', 1)[1].strip()
-                elif 'Log file:' in line or 'log_file:' in line:
-                    log_file = line.split(':', 1)[1].strip()
+            for match in _OUTPUT_PATH_RE.finditer(stdout):
+                if match.group(1).lower().startswith('output'):
+                    output_file = match.group(2).strip()
+                else:
+                    log_file = match.group(2).strip()
 
             # If not found in output, construct expected paths
             if not output_file and output_dir:
@@ -108,30 +399,156 @@ def generate_video():
                         output_file = potential_file
                         break
 
-            return jsonify({
+            if cache_key and output_file and os.path.isfile(output_file):
+                _store_render(output_file, cache_key)
+
+            return {
                 'success': True,
                 'output_file': output_file or 'Video generated (check output directory)',
                 'log_file': log_file or 'Log file created',
-                'stdout': result.stdout,
+                'stdout': stdout,
                 'config_path': config_path
-            })
+            }, 200
         else:
-            logger.error(f"Video generation failed with return code {result.returncode}")
-            logger.error(f"STDERR: {result.stderr}")
+            # The end of the combined output holds the error or traceback
+            error_tail = ''.join(output_lines[-ERROR_TAIL_LINES:])
+            logger.error(f"Video generation failed with return code {returncode}")
+            logger.error(f"OUTPUT (last {ERROR_TAIL_LINES} lines): {error_tail}")
 
-            return jsonify({
+            return {
                 'success': False,
-                'error': f'Video generation failed: {result.stderr}',
-                'stdout': result.stdout,
-                'return_code': result.returncode
-            }), 500
+                'error': f'Video generation failed: {error_tail}',
+                'stdout': stdout,
+                'return_code': returncode
+            }, 500
 
     except subprocess.TimeoutExpired:
         logger.error("Video generation timed out")
-        return jsonify({
+        return {
             'success': False,
             'error': 'Video generation timed out (exceeded 1 hour)'
-        }), 500
+        }, 500
+    except Exception as e:
+        logger.error(f"Error during video generation: {str(e)}", exc_info=True)
+        return {
+            'success': False,
+            'error': f'Server error: {str(e)}'
+        }, 500
+
+@app.route('/api/generate', methods=['POST'])
+def generate_video():
+    """
+    Queue video generation from YAML configuration
+
+    The render runs on a background worker; poll
+    /api/generate/status/<job_id> for the result.
+
+    Expected JSON payload:
+    {
+        "yaml_content": "...",
+        "filename": "config.yaml",
+        "output_dir": "/path/to/output"
+    }
+    """
+    try:
+        data = _json_body()
+        yaml_content = data.get('yaml_content')
+        filename = data.get('filename', 'config.yaml')
+        output_dir = data.get('output_dir', '')
+
+        if not yaml_content:
+            return jsonify({'success': False, 'error': 'No YAML content provided'}), 400
+
+        yaml_bytes = yaml_content.encode('utf-8')
+        if len(yaml_bytes) > MAX_YAML_BYTES:
+            return jsonify({'success': False, 'error': 'YAML too large'}), 413
+
+        # Create output directory if it doesn't exist
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+            config_path = os.path.join(output_dir, filename)
+        else:
+            config_path = os.path.join(PROJECT_ROOT, filename)
+
+        # Write YAML file
+        logger.info(f"Writing config to: {config_path}")
+        try:
+            _write_file(config_path, yaml_bytes)
+        except OSError as e:
+            logger.error(f"Failed to write config {config_path}: {e}")
+            return jsonify({'success': False, 'error': f'Could not write config file: {e}'}), 500
+
+        # Config already parsed by /api/validate: hand it to the child as JSON
+        # so the render doesn't parse the YAML again
+        config = _cached_config(_yaml_hash(yaml_content))
+        if config is not None and config.write_json_cache(config_path):
+            logger.info(f"Wrote pre-parsed config cache for: {config_path}")
+
+        # Identical config and inputs already rendered: reuse that video
+        cache_key = None
+        output_file = None
+        if config is None:
+            try:
+                sys.path.insert(0, str(PROJECT_ROOT))
+                from config import ProjectConfig
+                config = ProjectConfig.from_string(yaml_content)
+            except Exception:
+                config = None  # The render reports the config error itself
+        if config is not None:
+            paths = config.get_paths()
+            output_file = paths.get('output_file')
+            if output_file:
+                cache_key = _render_fingerprint(yaml_content, paths)
+                if _reuse_cached_render(output_file, cache_key):
+                    logger.info(f"Render cache hit, reused render {cache_key}")
+                    return jsonify({
+                        'success': True,
+                        'cached': True,
+                        'output_file': output_file,
+                        'log_file': 'Reused cached render (no new log)',
+                        'config_path': config_path
+                    }), 200
+
+                # A previous output may be hard linked to a cache entry;
+                # unlink it so the new render doesn't overwrite the cached copy
+                try:
+                    if os.stat(output_file).st_nlink > 1:
+                        os.remove(output_file)
+                except OSError:
+                    pass
+
+        if not SCRIPT_PATH.exists():
+            return jsonify({
+                'success': False,
+                'error': f'Slideshow script not found at {SCRIPT_PATH}'
+            }), 404
+
+        # Queue the slideshow generation script
+        logger.info(f"Starting video generation with config: {config_path}")
+
+        cmd = [sys.executable, _SCRIPT_PATH_STR, '--config', config_path]
+        logger.info(f"Running command: {' '.join(cmd)}")
+
+        job_id = uuid.uuid4().hex
+        output_lines = []
+        future = render_executor.submit(
+            _run_generation, cmd, config_path, output_dir, filename, output_lines, cache_key
+        )
+        with _render_jobs_lock:
+            render_jobs[job_id] = (future, output_lines)
+        future.add_done_callback(lambda _: _mark_render_job_done(job_id))
+        _prune_render_jobs()
+
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'status_url': f'/api/generate/status/{job_id}',
+            'config_path': config_path
+        }), 202
+
+    except RequestEntityTooLarge:
+        # Body over MAX_CONTENT_LENGTH (declared, or found while reading a chunked body)
+        return jsonify({'success': False, 'error': 'YAML too large'}), 413
     except Exception as e:
         logger.error(f"Error during video generation: {str(e)}", exc_info=True)
         return jsonify({
@@ -139,6 +556,75 @@ def generate_video():
             'error': f'Server error: {str(e)}'
         }), 500
 
+@app.route('/api/generate/status/<job_id>', methods=['GET'])
+def generation_status(job_id):
+    """
+    Report the state of a queued video generation
+
+    Returns "queued"/"running" while the job is pending, then the same
+    payload the render produced (success, output_file, stdout, ...).
+    """
+    job = render_jobs.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': f'Unknown job: {job_id}'}), 404
+
+    future, output_lines = job
+    if not future.done():
+        status = 'running' if future.running() else 'queued'
+        return jsonify({
+            'success': True,
+            'status': status,
+            'job_id': job_id,
+            'last_line': output_lines[-1].strip() if output_lines else ''
+        })
+
+    # Finished jobs are reported once, then forgotten
+    _forget_render_job(job_id)
+    payload, status_code = future.result()
+    payload['status'] = 'finished'
+    payload['job_id'] = job_id
+    return jsonify(payload), status_code
+
+def _count_images(images_dir: str) -> int:
+    """Count JPEG/PNG files in a folder with one scandir pass (no path list)"""
+    count = 0
+    with os.scandir(images_dir) as it:
+        for entry in it:
+            if os.path.splitext(entry.name)[1].lower() in PROJECT_IMAGE_EXTENSIONS:
+                count += 1
+    return count
+
+@app.route('/api/generate/stream/<job_id>', methods=['GET'])
+def generation_stream(job_id):
+    """
+    Stream a queued generation's output as Server-Sent Events
+
+    Each stdout line is sent as a data event; a final "done" event carries
+    the job's result payload.
+    """
+    job = render_jobs.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': f'Unknown job: {job_id}'}), 404
+
+    future, output_lines = job
+
+    def events():
+        sent = 0
+        while True:
+            finished = future.done()
+            # Lines are only ever appended, so a length snapshot is safe
+            available = len(output_lines)
+            for line in output_lines[sent:available]:
+                yield f"data: {line.rstrip()}\n\n"
+            sent = available
+            if finished:
+                payload, _ = future.result()
+                yield f"event: done\ndata: {json.dumps(payload)}\n\n"
+                return
+            time.sleep(STREAM_POLL_INTERVAL)
+
+    return Response(events(), mimetype='text/event-stream')
+
 @app.route('/api/validate', methods=['POST'])
 def validate_config():
     """
@@ -150,81 +636,78 @@ def validate_config():
     }
     """
     try:
-        import yaml
-        import tempfile
         sys.path.insert(0, str(PROJECT_ROOT))
         from config import ProjectConfig
 
-        data = request.json
+        data = _json_body()
         yaml_content = data.get('yaml_content')
 
         if not yaml_content:
             return jsonify({'valid': False, 'errors': ['No YAML content provided']}), 400
 
-        # Write to temp file for validation
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False, encoding='utf-8') as f:
-            f.write(yaml_content)
-            temp_path = f.name
-
-        try:
-            # Try to load and validate config
-            config = ProjectConfig(temp_path)
-            validation_errors = config.validate()
-
-            # Additional checks
-            warnings = []
-
-            # Check if special photo is specified
-            special_images = config.get_special_images()
-            if special_images.get('opening_closing'):
+        if len(yaml_content.encode('utf-8')) > MAX_YAML_BYTES:
+            return jsonify({'valid': False, 'errors': ['YAML too large']}), 413
+
+        # Re-submitted content skips the YAML parse; validate() itself
+        # always runs since it checks the filesystem
+        content_hash = _yaml_hash(yaml_content)
+        config = _cached_config(content_hash)
+
+        # Try to load and validate config
+        if config is None:
+            config = ProjectConfig.from_string(yaml_content)
+            _cache_config(content_hash, config)
+        validation_errors = config.validate()
+
+        # Additional checks
+        warnings = []
+
+        # Check if special photo is specified
+        special_images = config.get_special_images()
+        if special_images.get('opening_closing'):
+            warnings.append(
+                f"Special photo '{special_images['opening_closing']}' must exist in images directory. "
+                "If not found, first image will be used as fallback."
+            )
+
+        # Check for resource-intensive settings
+        effect_settings = config.get_effect_settings()
+        kb_config = effect_settings.get('ken_burns', {})
+        kb_rate = kb_config.get('application_rate', 0.65)
+
+        paths = config.get_paths()
+        images_dir = paths.get('images_dir', '')
+        if images_dir and os.path.exists(images_dir):
+            image_count = _count_images(images_dir)
+
+            if image_count > 25:
                 warnings.append(
-                    f"Special photo '{special_images['opening_closing']}' must exist in images directory. "
-                    "If not found, first image will be used as fallback."
+                    f"Large project detected ({image_count} images). "
+                    "Memory optimizations will be applied automatically (Ken Burns and color grading will be limited)."
+                )
+            elif image_count > 15 and kb_rate > 0.7:
+                warnings.append(
+                    f"Moderate project size ({image_count} images) with high Ken Burns rate ({kb_rate:.0%}). "
+                    "Consider reducing Ken Burns application rate to 0.5-0.6 for better performance."
                 )
 
-            # Check for resource-intensive settings
-            effect_settings = config.get_effect_settings()
-            kb_config = effect_settings.get('ken_burns', {})
-            kb_rate = kb_config.get('application_rate', 0.65)
-
-            paths = config.get_paths()
-            images_dir = paths.get('images_dir', '')
-            if images_dir and os.path.exists(images_dir):
-                import glob
-                image_count = len(glob.glob(os.path.join(images_dir, '*.[jp][pn]g*')))
-
-                if image_count > 25:
-                    warnings.append(
-                        f"Large project detected ({image_count} images). "
-                        "Memory optimizations will be applied automatically (Ken Burns and color grading will be limited)."
-                    )
-                elif image_count > 15 and kb_rate > 0.7:
-                    warnings.append(
-                        f"Moderate project size ({image_count} images) with high Ken Burns rate ({kb_rate:.0%}). "
-                        "Consider reducing Ken Burns application rate to 0.5-0.6 for better performance."
-                    )
-
-            if validation_errors:
-                return jsonify({
-                    'valid': False,
-                    'errors': validation_errors,
-                    'warnings': warnings
-                })
-            else:
-                return jsonify({
-                    'valid': True,
-                    'errors': [],
-                    'warnings': warnings,
-                    'message': 'Configuration is valid'
-                })
-
-        finally:
-            # Clean up temp file
-            try:
-                os.unlink(temp_path)
-            except:
-                pass
+        if validation_errors:
+            return jsonify({
+                'valid': False,
+                'errors': validation_errors,
+                'warnings': warnings
+            })
+        else:
+            return jsonify({
+                'valid': True,
+                'errors': [],
+                'warnings': warnings,
+                'message': 'Configuration is valid'
+            })
 
+    except RequestEntityTooLarge:
+        # Body over MAX_CONTENT_LENGTH (declared, or found while reading a chunked body)
+        return jsonify({'valid': False, 'errors': ['YAML too large']}), 413
     except Exception as e:
         logger.error(f"Validation error: {str(e)}", exc_info=True)
         return jsonify({
@@ -232,6 +715,28 @@ def validate_config():
             'errors': [f'Validation failed: {str(e)}']
         }), 500
 
+def _find_quick_paths() -> list:
+    """Common user folders that exist on this machine"""
+    # Get user home directory
+    home = Path.home()
+
+    # Common folders
+    common_folders = [
+        ("Desktop", home / "Desktop"),
+        ("Documents", home / "Documents"),
+        ("Pictures", home / "Pictures"),
+        ("Music", home / "Music"),
+        ("Videos", home / "Videos"),
+    ]
+
+    # Build response with existing folders only
+    paths = []
+    for name, path in common_folders:
+        if path.exists():
+            # Forward slashes for consistency
+            paths.append({"name": name, "path": path.as_posix()})
+    return paths
+
 @app.route('/api/browse/quick-paths', methods=['GET'])
 def get_quick_paths():
     """
@@ -247,30 +752,14 @@ def get_quick_paths():
     }
     """
     try:
-        import os
-        from pathlib import Path
-
-        # Get user home directory
-        home = Path.home()
-
-        # Common folders
-        common_folders = [
-            ("Desktop", home / "Desktop"),
-            ("Documents", home / "Documents"),
-            ("Pictures", home / "Pictures"),
-            ("Music", home / "Music"),
-            ("Videos", home / "Videos"),
-        ]
+        now = time.monotonic()
+        if _quick_paths_cache['body'] is None or now - _quick_paths_cache['time'] > QUICK_PATHS_TTL:
+            _quick_paths_cache['body'] = json.dumps(
+                {"success": True, "paths": _find_quick_paths()}
+            ).encode('utf-8')
+            _quick_paths_cache['time'] = now
 
-        # Build response with existing folders only
-        paths = []
-        for name, path in common_folders:
-            if path.exists():
-                # Convert to forward slashes for consistency
-                path_str = str(path).replace('\\', '/')
-                paths.append({"name": name, "path": path_str})
-
-        return jsonify({"success": True, "paths": paths})
+        return Response(_quick_paths_cache['body'], mimetype='application/json')
 
     except Exception as e:
         logger.error(f"Error getting quick paths: {str(e)}", exc_info=True)
@@ -286,7 +775,9 @@ def browse_folder():
 
     Expected JSON payload:
     {
-        "path": "C:/Users/Username/Documents"
+        "path": "C:/Users/Username/Documents",
+        "offset": 0,      (optional)
+        "limit": 500      (optional, at most 2000)
     }
 
     Returns:
@@ -297,7 +788,10 @@ def browse_folder():
         "folders": [
             {"name": "Folder1", "path": "C:/Users/Username/Documents/Folder1"},
             {"name": "Folder2", "path": "C:/Users/Username/Documents/Folder2"}
-        ]
+        ],
+        "offset": 0,
+        "total": 2,
+        "has_more": false
     }
     """
     try:
@@ -329,37 +823,61 @@ def browse_folder():
         # Get parent path (if not at root)
         parent_path = None
         if path.parent != path:  # Not at root
-            parent_path = str(path.parent).replace('\\', '/')
+            parent_path = path.parent.as_posix()
 
         # Check if we should include image files
         include_images = data.get('include_images', False)
-        image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.gif', '.tiff', '.webp'}
 
-        # List all subfolders (and optionally image files)
-        folders = []
-        files = []
         try:
-            for item in sorted(path.iterdir()):
-                if item.is_dir():
-                    # Skip hidden folders and system folders
-                    if not item.name.startswith('.') and not item.name.startswith('$'):
-                        folders.append({
-                            "name": item.name,
-                            "path": str(item).replace('\\', '/')
-                        })
-                elif include_images and item.suffix.lower() in image_extensions:
-                    files.append({
-                        "name": item.name,
-                        "path": str(item).replace('\\', '/')
-                    })
+            offset = max(int(data.get('offset', 0)), 0)
+            limit = min(max(int(data.get('limit', BROWSE_PAGE_SIZE)), 1), BROWSE_MAX_PAGE_SIZE)
+        except (TypeError, ValueError):
+            return jsonify({
+                "success": False,
+                "error": "offset and limit must be integers"
+            }), 400
+
+        # Collect subfolders (and optionally image files) as light
+        # (is_file, lowercase name, name, path) tuples; scandir entries
+        # carry the file type, so no extra stat per item
+        matches = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    name = entry.name
+                    if name[:1] in HIDDEN_PREFIXES:
+                        # Hidden and system folders are skipped, so only an
+                        # image file can match; test the name before is_dir()
+                        if (include_images and os.path.splitext(name)[1].lower() in BROWSE_IMAGE_EXTENSIONS
+                                and not entry.is_dir()):
+                            matches.append((True, name.lower(), name, entry.path))
+                    elif entry.is_dir():
+                        matches.append((False, name.lower(), name, entry.path))
+                    elif include_images and os.path.splitext(name)[1].lower() in BROWSE_IMAGE_EXTENSIONS:
+                        matches.append((True, name.lower(), name, entry.path))
         except PermissionError:
             logger.warning(f"Permission denied accessing some items in {folder_path}")
 
+        # Folders first, then files, each by case-insensitive name (exact name
+        # breaks ties so pages stay stable); only the requested page
+        # is sorted and turned into dicts
+        page = heapq.nsmallest(offset + limit, matches)[offset:]
+        folders = []
+        files = []
+        for is_file, _, name, entry_path in page:
+            (files if is_file else folders).append({
+                "name": name,
+                "path": entry_path.replace(os.sep, '/')
+            })
+
         result = {
             "success": True,
-            "current_path": str(path).replace('\\', '/'),
+            "current_path": path.as_posix(),
             "parent_path": parent_path,
-            "folders": folders
+            "folders": folders,
+            "offset": offset,
+            "total": len(matches),
+            "has_more": offset + len(page) < len(matches)
         }
 
         if include_images:
@@ -374,35 +892,49 @@ def browse_folder():
             "error": f"Failed to browse folder: {str(e)}"
         }), 500
 
+# Process-invariant answers for /api/health and /, serialized once at import
+HEALTH_BODY = json.dumps({
+    'status': 'healthy',
+    'project_root': str(PROJECT_ROOT),
+    'script_exists': (PROJECT_ROOT / 'create_slideshow_enhanced.py').exists()
+}, sort_keys=True).encode('utf-8')
+
+INDEX_BODY = json.dumps({
+    'message': 'Slideshow Configuration Builder API',
+    'version': '1.2',
+    'endpoints': {
+        '/api/generate': 'POST - Queue video generation from YAML config',
+        '/api/generate/status/<job_id>': 'GET - Poll a queued video generation',
+        '/api/generate/stream/<job_id>': 'GET - Stream generation output (Server-Sent Events)',
+        '/api/validate': 'POST - Validate YAML config before generation',
+        '/api/browse/quick-paths': 'GET - Get common user folders for quick access',
+        '/api/browse/folder': 'POST - Browse folder contents and subfolders',
+        '/api/health': 'GET - Health check'
+    }
+}, sort_keys=True).encode('utf-8')
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({
-        'status': 'healthy',
-        'project_root': str(PROJECT_ROOT),
-        'script_exists': (PROJECT_ROOT / 'create_slideshow_enhanced.py').exists()
-    })
+    response = Response(HEALTH_BODY, mimetype='application/json')
+    # Let clients reuse the answer for quick successive checks
+    response.headers['Cache-Control'] = 'max-age=5'
+    return response
 
 @app.route('/', methods=['GET'])
 def index():
     """Root endpoint"""
-    return jsonify({
-        'message': 'Slideshow Configuration Builder API',
-        'version': '1.2',
-        'endpoints': {
-            '/api/generate': 'POST - Generate video from YAML config',
-            '/api/validate': 'POST - Validate YAML config before generation',
-            '/api/browse/quick-paths': 'GET - Get common user folders for quick access',
-            '/api/browse/folder': 'POST - Browse folder contents and subfolders',
-            '/api/health': 'GET - Health check'
-        }
-    })
+    return Response(INDEX_BODY, mimetype='application/json')
 
 if __name__ == '__main__':
     logger.info(f"Starting server...")
     logger.info(f"Project root: {PROJECT_ROOT}")
+    logger.info(f"PyYAML C loader available: {yaml.__with_libyaml__}")
+    logger.info(f"Response compression available: {COMPRESS_AVAILABLE}")
     logger.info(f"Script exists: {(PROJECT_ROOT / 'create_slideshow_enhanced.py').exists()}")
     logger.info(f"Server running at http://localhost:5000")
     logger.info(f"Frontend should be opened from: {PROJECT_ROOT / 'web_gui' / 'index.html'}")
 
-    app.run(host='127.0.0.1', port=5000, debug=True)
+    # One thread per request, so a long /api/generate doesn't block health/browse calls.
+    # Debug mode (reloader + debugger) only when DEV is set; see wsgi.py for gunicorn
+    app.run(host='127.0.0.1', port=5000, debug=bool(os.environ.get('DEV')), threaded=True)
@@ -0,0 +1,13 @@
+"""
+WSGI entry point for running the backend under a production server
+
+Usage (from the web_gui directory, Linux/macOS):
+    gunicorn wsgi:app
+
+Settings are read from gunicorn.conf.py in this directory. On Windows,
+where gunicorn is not available, keep using `python server.py`.
+"""
+
+from server import app
+
+__all__ = ['app']